@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmarks voor de oog-renderer (kattenoog_plc_udp_oneeye.py), draait zonder scherm.
+
+  python3 eye_bench.py iris                 # cirkel-lus vs NumPy iris, 1080 en 720
+  python3 eye_bench.py iris --steps 254     # + vergelijk beeld bij hoge IRIS_STEPS
+  python3 eye_bench.py backends             # surface-blits vs SDL2 texture (--bench per backend)
+  python3 eye_bench.py damp                 # scalar smooth_damp vs DampBank, per aantal kanalen en ogen
+  python3 eye_bench.py layers               # Eye.draw: vlak (oud) vs lagen met parallax + glimlicht
+  python3 eye_bench.py bank                 # lange sweep met klein pupilbudget: geheugen/fds moeten vlak blijven
+"""
+import os, sys, time, argparse, subprocess, tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+import kattenoog_plc_udp_oneeye as ko
+
+def timeit(fn, repeat):
+    best = float("inf"); total = 0.0
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); dt = time.perf_counter() - t0
+        best = min(best, dt); total += dt
+    return best*1000.0, total/repeat*1000.0
+
+def bench_iris(args):
+    if ko.np is None:
+        print("numpy niet geïnstalleerd: alleen de cirkel-lus beschikbaar"); return
+    np = ko.np
+    ko.CFG["IRIS_STEPS"] = args.steps
+    for size in args.sizes:
+        w = h = size
+        ko._IRIS_FIELDS.clear()
+        t0 = time.perf_counter(); ko.iris_level_field(w,h); t_field = (time.perf_counter()-t0)*1000.0
+        b_old, m_old = timeit(lambda: ko.make_eye_base_circles(w,h, strength=0.5), args.repeat)
+        b_new, m_new = timeit(lambda: ko.make_eye_base(w,h, strength=0.5), args.repeat)
+        b_pal, m_pal = timeit(lambda: ko.make_iris_index(w,h)[0].set_palette(ko.iris_palette(0.7)), args.repeat)
+
+        old = pygame.surfarray.array3d(ko.make_eye_base_circles(w,h, strength=0.5)[0]).astype(np.int16)
+        new = pygame.surfarray.array3d(ko.make_eye_base(w,h, strength=0.5)[0]).astype(np.int16)
+        diff = np.abs(old - new)
+        print(f"{w}x{h} steps={args.steps}")
+        print(f"  circles   best {b_old:7.2f} ms  mean {m_old:7.2f} ms")
+        print(f"  numpy     best {b_new:7.2f} ms  mean {m_new:7.2f} ms  (afstandsveld eenmalig {t_field:.2f} ms)")
+        print(f"  palette   best {b_pal:7.2f} ms  mean {m_pal:7.2f} ms  (index + palet)")
+        print(f"  verschil  max {int(diff.max())}  gem {diff.mean():.3f}  "
+              f"pixels >2: {int((diff.max(axis=2) > 2).sum())}")
+
+def bench_backends(args):
+    # elke backend in een eigen proces: één venster/renderer per proces
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kattenoog_plc_udp_oneeye.py")
+    for backend in ("surface", "texture"):
+        cmd = [sys.executable, script, "--eye", "right", "--bench", str(args.frames), "--no-cache",
+               "--backend", backend, "--width", str(args.size), "--height", str(args.size)]
+        out = subprocess.run(cmd, capture_output=True, text=True).stdout
+        lines = [l for l in out.splitlines() if l.startswith("[bench]") or "backend (" in l]
+        print(f"{backend}:")
+        for l in lines or ["  (geen uitvoer)"]:
+            print("  " + l)
+
+def bench_damp(args):
+    import random
+    random.seed(1)
+    for n in args.channels:
+        init = [(random.uniform(-300, 300), random.uniform(-300, 300), random.choice((0.05, 0.08, 0.12)),
+                 random.choice((10.0, 99.0, 2000.0)), random.random() > 0.2) for _ in range(n)]
+        bank = ko.DampBank()
+        for v, t, st, ms, keep in init:
+            i = bank.add(v, st, ms, keep_velocity=keep)
+            bank.target[i] = t
+        chans = [[v, 0.0, t, st, ms, keep] for v, t, st, ms, keep in init]
+
+        def scalar():
+            for c in chans:
+                v, vel = ko.smooth_damp(c[0], c[2], c[1] if c[5] else 0.0, c[3], 1/60.0, c[4])
+                c[0] = v; c[1] = vel if c[5] else 0.0
+
+        b_s, m_s = timeit(lambda: [scalar() for _ in range(args.steps)], args.repeat)
+        b_b, m_b = timeit(lambda: [bank.step(1/60.0) for _ in range(args.steps)], args.repeat)
+        diff = max(max(abs(c[0] - float(bank.value[i])), abs(c[1] - float(bank.velocity[i])))
+                   for i, c in enumerate(chans))
+        print(f"{n:5d} kanalen  scalar {b_s*1000/args.steps:8.2f} us/stap  "
+              f"batch {b_b*1000/args.steps:8.2f} us/stap  ({b_s/b_b:5.2f}x)  max verschil {diff:g}")
+    # per frame voor n ogen: Eye.step per oog vs één gedeelde bankstap (BatchedEye)
+    scr = pygame.Surface((256, 256))
+    bank_pupils = ko.PupilBank(16)
+    for n in args.eyes:
+        scalar = [ko.Eye(scr, 256, 256, pupils=bank_pupils) for _ in range(n)]
+        bank = ko.DampBank()
+        batched = [ko.BatchedEye(scr, 256, 256, pupils=bank_pupils, damp=bank) for _ in range(n)]
+        for e in scalar + batched:
+            e.tx, e.scale_target = 100.0, 1.5
+        b_s, _ = timeit(lambda: [[e.step(1/60.0) for e in scalar] for _ in range(args.steps)], args.repeat)
+        b_b, _ = timeit(lambda: [ko.step_damp_group(batched, 1/60.0) for _ in range(args.steps)], args.repeat)
+        print(f"{n:5d} ogen     scalar {b_s*1000/args.steps:8.2f} us/frame "
+              f"batch {b_b*1000/args.steps:8.2f} us/frame ({b_s/b_b:5.2f}x)")
+
+def bench_layers(args):
+    scr = pygame.display.set_mode((args.size, args.size))
+    flat = {"PARALLAX_IRIS": 0.0, "GLINT": False}
+    layered = {"PARALLAX_IRIS": 0.35, "GLINT": True}
+    orig = {k: ko.CFG[k] for k in flat}
+    eyes = {}
+    for name, cfg in (("vlak", flat), ("lagen", layered)):
+        ko.CFG.update(cfg)
+        eyes[name] = (cfg, ko.Eye(scr, args.size, args.size))
+        eyes[name][1].prebuild_pupils()
+    best = {}
+    for _ in range(args.repeat):                 # afwisselend, beste mediaan telt
+        for name, (cfg, eye) in eyes.items():
+            ko.CFG.update(cfg)
+            times = []
+            for i in range(args.frames):
+                eye.set_targets_from_bytes(*ko.synthetic_script(i / 60.0)[:4], biris=128)
+                eye.update(1/60.0)
+                t0 = time.perf_counter(); eye.draw(); times.append(time.perf_counter() - t0)
+            times.sort()
+            p50 = times[len(times)//2] * 1000.0
+            best[name] = min(best.get(name, p50), p50)
+    ko.CFG.update(orig)
+    for name in eyes:
+        print(f"{name:6s} Eye.draw p50 {best[name]:.3f} ms")
+    print(f"lagen/vlak: {100.0*best['lagen']/best['vlak']:.0f}%")
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1048576.0
+    except (OSError, ValueError):
+        return float("nan")
+
+def open_fds():
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return -1
+
+def bench_bank(args):
+    # twee rondes: koude schijfcache (rasteren + wegschrijven), dan warm (laden uit de cache)
+    scr = pygame.display.set_mode((args.size, args.size))
+    ko.CFG["PUPIL_ROT_MB"] = args.budget_mb          # ook het gedraaide deel klein houden
+    ok = True
+    with tempfile.TemporaryDirectory() as d:
+        cache = ko.AssetCache(d)
+        for rnd in ("koud", "warm"):
+            bank = ko.PupilBank(args.budget_mb, cache=cache)
+            bank.rle_target = scr
+            eye = ko.Eye(scr, args.size, args.size, cache=cache, pupils=bank)
+            samples = []
+            for i in range(args.frames):
+                eye.set_targets_from_bytes(*ko.eye_fields(ko.synthetic_script(i / 60.0), "right"))
+                eye.update(1/60.0)
+                eye.draw()
+                if i >= args.frames // 5 and i % 100 == 0:   # na de opwarmfase meten
+                    samples.append((rss_mb(), open_fds()))
+            (r0, f0), (r1, f1) = samples[0], samples[-1]
+            grow = r1 - r0
+            flat = grow <= args.tolerance_mb and f1 <= f0
+            ok = ok and flat
+            print(f"{rnd}: rss {r0:.1f} -> {r1:.1f} MB ({grow:+.1f}), fds {f0} -> {f1}, "
+                  f"{bank.stats()}  {'vlak' if flat else 'GROEIT'}")
+    return 0 if ok else 1
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmarks oog-renderer (headless)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("iris", help="iris-generator: cirkel-lus vs NumPy")
+    p.add_argument("--sizes", type=lambda s: [int(v) for v in s.split(",")], default=[1080,720])
+    p.add_argument("--steps", type=int, default=ko.CFG["IRIS_STEPS"])
+    p.add_argument("--repeat", type=int, default=5)
+    p = sub.add_parser("backends", help="frametijd surface- vs texture-backend")
+    p.add_argument("--frames", type=int, default=1200)
+    p.add_argument("--size", type=int, default=1080)
+    p = sub.add_parser("layers", help="Eye.draw: vlak vs lagen (parallax + glimlicht)")
+    p.add_argument("--size", type=int, default=1080)
+    p.add_argument("--frames", type=int, default=600)
+    p.add_argument("--repeat", type=int, default=3)
+    p = sub.add_parser("bank", help="lange sweep met klein pupilbudget: geheugen en fds vlak?")
+    p.add_argument("--size", type=int, default=1080)
+    p.add_argument("--frames", type=int, default=3000)
+    p.add_argument("--budget-mb", type=float, default=0.5)
+    p.add_argument("--tolerance-mb", type=float, default=8.0, help="toegestane RSS-groei na opwarmen")
+    p = sub.add_parser("damp", help="smooth_damp: scalar per kanaal vs DampBank (NumPy)")
+    p.add_argument("--channels", type=lambda s: [int(v) for v in s.split(",")], default=[5,10,20,50,200,1000])
+    p.add_argument("--eyes", type=lambda s: [int(v) for v in s.split(",")], default=[1,2,8,32])
+    p.add_argument("--steps", type=int, default=200)
+    p.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+    if args.cmd == "backends":
+        return bench_backends(args)
+
+    pygame.display.init()
+    pygame.display.set_mode((1,1))
+    rc = {"iris": bench_iris, "damp": bench_damp, "layers": bench_layers,
+          "bank": bench_bank}[args.cmd](args)
+    pygame.quit()
+    return rc
+
+if __name__ == "__main__":
+    sys.exit(main())
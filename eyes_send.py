@@ -13,13 +13,40 @@ ap.add_argument("--rx", type=int, default=128)
 ap.add_argument("--ry", type=int, default=128)
 ap.add_argument("--rblink", type=int, default=0)
 ap.add_argument("--rpupil", type=int, default=180)
+ap.add_argument("--lrot", type=int, default=None, help="pupilkanteling links 0..255 (128 = recht) -> 12 bytes")
+ap.add_argument("--rrot", type=int, default=None, help="pupilkanteling rechts 0..255 (128 = recht) -> 12 bytes")
+ap.add_argument("--lev", type=int, default=None, help="knipperteller links 0..255 (andere waarde = knipper) -> 14 bytes")
+ap.add_argument("--rev", type=int, default=None, help="knipperteller rechts 0..255 -> 14 bytes")
+ap.add_argument("--lexpr", type=int, default=None, help="expressie-preset links (0 = geen, 1.. = tabel) -> 18 bytes")
+ap.add_argument("--rexpr", type=int, default=None, help="expressie-preset rechts -> 18 bytes")
+ap.add_argument("--blend", type=int, default=50, help="overvloeitijd preset in stappen van 20 ms (beide ogen)")
 ap.add_argument("--sweep", action="store_true", help="sweep horizontaal L/R")
+ap.add_argument("--seq", action="store_true", help="met volgnummer-header (jitterbuffer; oog met --seq-header)")
+ap.add_argument("--period", type=float, default=0.02, help="sweep-interval (s)")
 args = ap.parse_args()
+seq = 0
 
 def clamp(x): return max(0, min(255, int(x)))
 def payload(lx,ly,lb,lp, rx,ry,rb,rp):
+    global seq
     vals = [clamp(v) for v in (lx,ly,lb,lp, rx,ry,rb,rp)]
-    return struct.pack("8B", *vals)
+    expr = args.lexpr is not None or args.rexpr is not None
+    ev = args.lev is not None or args.rev is not None or expr
+    if args.lrot is not None or args.rrot is not None or ev:
+        # 12 bytes: iris neutraal (128), dan Lrot,Rrot
+        vals += [128, 128, clamp(128 if args.lrot is None else args.lrot),
+                 clamp(128 if args.rrot is None else args.rrot)]
+    if ev:
+        # 14 bytes: + Lev,Rev (knipperteller; elke verandering = één lokale knipper)
+        vals += [clamp(args.lev or 0), clamp(args.rev or 0)]
+    if expr:
+        # 18 bytes: + Lexpr,Rexpr,Lblend,Rblend
+        vals += [clamp(args.lexpr or 0), clamp(args.rexpr or 0), clamp(args.blend), clamp(args.blend)]
+    p = struct.pack(f"{len(vals)}B", *vals)
+    if args.seq:
+        p = struct.pack("<4sHI", b"KOSQ", seq & 0xFFFF, int(time.monotonic()*1000) & 0xFFFFFFFF) + p
+        seq += 1
+    return p
 
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
@@ -27,11 +54,11 @@ def send_once(lx,ly,lb,lp, rx,ry,rb,rp):
     p = payload(lx,ly,lb,lp, rx,ry,rb,rp)
     sock.sendto(p, (args.left,  args.port))
     sock.sendto(p, (args.right, args.port))
-    print("sent:", [lx,ly,lb,lp, rx,ry,rb,rp])
+    print("sent:", list(p[10:] if args.seq else p))      # zonder de 10-byte header
 
 if args.sweep:
     for x in list(range(0,256,8)) + list(range(255,-1,-8)):
-        send_once(x,128,0,180, 255-x,128,0,180); time.sleep(0.02)
+        send_once(x,128,0,180, 255-x,128,0,180); time.sleep(args.period)
 else:
     send_once(args.lx,args.ly,args.lblink,args.lpupil,
               args.rx,args.ry,args.rblink,args.rpupil)
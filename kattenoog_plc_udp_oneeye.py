@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
-import os, socket, struct, pygame, time, math, argparse
+import os, socket, struct, pygame, time, math, argparse, hashlib, json, mmap, select, threading, bisect, random
+from collections import namedtuple, deque, OrderedDict
 import pygame.gfxdraw
 
+try:  # optioneel: snelle iris-generator via surfarray
+    import numpy as np
+    import pygame.surfarray
+except ImportError:
+    np = None
+
 # ---------- kleine helpers ----------
 def clamp(x,a,b): return a if x<a else b if x>b else x
 
@@ -21,6 +28,118 @@ def smooth_damp(current, target, velocity, smooth_time, dt, max_speed=float("inf
         new_value, new_velocity = target, 0.0
     return new_value, new_velocity
 
+class DampBank:
+    """
+    smooth_damp voor veel kanalen tegelijk: waarde, snelheid, doel, smooth_time
+    en max_speed per kanaal in arrays, step() doet alle kanalen (of een reeks)
+    in één gevectoriseerde stap met dezelfde rekenvolgorde als smooth_damp,
+    dus bit-gelijk. Kanalen zonder snelheidsgeheugen (keep_velocity=False)
+    krijgen elke stap snelheid 0, zoals het ooglid. Zonder NumPy: lijsten en
+    per kanaal smooth_damp.
+    """
+    FIELDS = ("value", "velocity", "target", "smooth", "max_speed", "keep")
+
+    def __init__(self):
+        for f in self.FIELDS:
+            setattr(self, f, np.zeros(0, dtype=bool if f == "keep" else float) if np is not None else [])
+
+    def __len__(self):
+        return len(self.value)
+
+    def add(self, value, smooth, max_speed=float("inf"), keep_velocity=True):
+        """Nieuw kanaal (waarde = doel, stilstaand); geeft de index terug."""
+        row = (value, 0.0, value, smooth, max_speed, keep_velocity)
+        for f, v in zip(self.FIELDS, row):
+            a = getattr(self, f)
+            if np is not None:
+                setattr(self, f, np.append(a, np.array([v], dtype=a.dtype)))
+            else:
+                a.append(v)
+        return len(self) - 1
+
+    def step(self, dt, lo=0, hi=None):
+        """Eén stap voor kanalen lo..hi (standaard alle)."""
+        hi = len(self) if hi is None else hi
+        if np is None:
+            for i in range(lo, hi):
+                v, vel = smooth_damp(self.value[i], self.target[i],
+                                     self.velocity[i] if self.keep[i] else 0.0,
+                                     self.smooth[i], dt, self.max_speed[i])
+                self.value[i] = v
+                self.velocity[i] = vel if self.keep[i] else 0.0
+            return
+        s = slice(lo, hi)
+        current, target, velocity = self.value[s], self.target[s], self.velocity[s]
+        smooth_time = np.maximum(1e-4, self.smooth[s])
+        omega = 2.0 / smooth_time
+        x = omega * dt
+        exp = 1.0 / (1.0 + x + 0.48*x*x + 0.235*x*x*x)
+        change = current - target
+        max_change = self.max_speed[s] * smooth_time
+        change = np.maximum(-max_change, np.minimum(max_change, change))
+        target_temp = current - change
+        temp = (velocity + omega * change) * dt
+        new_velocity = (velocity - omega * temp) * exp
+        new_value = target_temp + (change + temp) * exp
+        over = (target - current) * (new_value - target) > 0
+        current[:] = np.where(over, target, new_value)
+        velocity[:] = np.where(over | ~self.keep[s], 0.0, new_velocity)
+
+# asset-rebuilds: naam -> [aantal, totale tijd (s), max (s)]
+REBUILDS = {}
+REBUILD_S = [0.0]            # rebuildtijd opgeteld sinds de laatste take_rebuild_time()
+
+def record_rebuild(name, seconds):
+    REBUILD_S[0] += seconds
+    r = REBUILDS.setdefault(name, [0, 0.0, 0.0])
+    r[0] += 1; r[1] += seconds
+    if seconds > r[2]: r[2] = seconds
+
+def rebuild_stats():
+    return ", ".join(f"{k} {n}x gem {tot/n*1000:.2f} ms max {mx*1000:.2f} ms"
+                     for k,(n,tot,mx) in sorted(REBUILDS.items())) or "geen rebuilds"
+
+def take_rebuild_time():
+    t = REBUILD_S[0]; REBUILD_S[0] = 0.0
+    return t
+
+def screen_format(surf, alpha=False):
+    """convert()/convert_alpha() naar het schermformaat; zonder display-surface
+    (texture-backend) blijft de surface zoals hij is."""
+    if pygame.display.get_surface() is None:
+        return surf
+    return surf.convert_alpha() if alpha else surf.convert()
+
+def rle_sprite(surf, dst, opaque=None, copy=True):
+    """
+    Per-pixel-alpha sprite RLE-gecodeerd (RLEACCEL, zoals de ooglid-sprites):
+    SDL houdt dan alleen de zichtbare runs vast (~1/3 van de ruwe pixels bij
+    een pupil) en blit sneller. Er wordt meteen gecodeerd, met een blit van
+    één transparante hoekpixel naar `dst` (geen zichtbaar effect), zodat de
+    ruwe pixels direct vrijkomen. SDL codeert opnieuw zodra een ander vlak het
+    doel is: `dst` is dus het vlak waar de sprite later op komt (deelvlakken
+    van één ouder tellen als hetzelfde). Geeft (surface, geschatte bytes);
+    met dst None ongewijzigd. `opaque`: aantal zichtbare pixels, anders
+    geteld met een mask.
+    """
+    if dst is None or surf.get_at((0, 0)).a:
+        return surf, surf.get_width() * surf.get_height() * surf.get_bytesize()
+    if opaque is None:
+        opaque = pygame.mask.from_surface(surf, 0).count()
+    if copy:
+        surf = surf.copy()           # eigen pixels, ook als hij op een cachebuffer stond
+    surf.set_alpha(255, pygame.RLEACCEL)
+    dst.blit(surf, (0, 0), (0, 0, 1, 1))
+    return surf, opaque * surf.get_bytesize() + surf.get_height() * 8
+
+def trim_heap():
+    """Vrijgegeven heap aan het OS teruggeven (glibc malloc_trim; elders niets)."""
+    try:
+        import ctypes
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
 def _hx(h):  # "#rrggbb" -> (r,g,b)
     h = h.lstrip('#'); return tuple(int(h[i:i+2],16) for i in (0,2,4))
 
@@ -33,6 +152,8 @@ CFG = {
     "IRIS_RIM_W":      0,                # optionele rand om iris (px)
     "IRIS_RIM_COL":    _hx("#000000"),
     "IRIS_STEPS":      64,               # kwaliteit gradient
+    "IRIS_MODE":       "palette",        # "palette" = 8-bit index + palet, "circles" = oude cirkel-lus
+    "IRIS_REBUILD_EPS": 0.02,            # circles-modus: iris pas herbouwen bij deze sterkteverandering
 
     # Pupilvorm
     "PUPIL_TAPER":     1.4,              # 1.3–2.0 = puntiger; hoger = ronder
@@ -41,15 +162,71 @@ CFG = {
     "PUPIL_EDGE_W":    0,                # groene rand-dikte (px)
     "PUPIL_EDGE_COL":  _hx("#7db02a"),
     "PUPIL_COL":       (0,0,0),
+    "PUPIL_VERTEX_PX": 3.0,              # ~1 vertex per zoveel px omtrek (32..400 vertices)
+    "PUPIL_AA":        True,             # anti-aliased pupilrand (gfxdraw.aapolygon)
+    "QUALITY_PREBUILD": 16,              # pupil-sprites direct tekenen na een kwaliteitswissel
+    "RENDER_SCALE":    1.0,              # interne renderresolutie t.o.v. het scherm (0.1..1)
+    "PUPIL_QUANT":     2,                # pupilmaat-stap (px, halve hoogte) in de sprite-bank
+    "PUPIL_BANK_MB":   96,               # geheugenbudget sprite-bank (MB)
+    "PUPIL_ROT_MAX":   25.0,             # graden kanteling bij rot-byte 0/255 (128 = recht)
+    "PUPIL_ROT_QUANT": 3.0,              # fijnste hoekstap (graden) van de vaste gedraaide set
+    "PUPIL_ROT_SIZE_Q": 2,               # gedraaide set: fijnste maatstap = PUPIL_QUANT x dit
+    "PUPIL_ROT_MB":    48,               # budget gedraaide set (MB), los van PUPIL_BANK_MB; stappen worden grover tot hij past
+
+    # Lagen: verschuiving t.o.v. de kijkrichting (pupil = 1.0) en een vast glimlicht
+    "PARALLAX_IRIS":   0.0,              # bv. 0.35: iris loopt trager mee dan de pupil -> diepte (0 = uit)
+    "PARALLAX_PUPIL":  1.0,
+    "PARALLAX_GLINT":  0.0,              # 0 = glimlicht staat stil
+    "GLINT":           False,            # vast glimlicht op de iris (opt-in, zoals de parallax)
+    "GLINT_POS":       (-0.32, -0.34),   # t.o.v. irismidden, in irisstralen
+    "GLINT_R":         0.07,             # straal in irisstralen
+    "GLINT_ALPHA":     190,
 
     # Oogleden
     "EYELID_COL":      (20,20,20),
+    "LID_MODE":        "rle",            # "rle" = gebogen (RLE-sprites), "spans" = gebogen (fill per span), "rect" = recht
+    "LID_LEVELS":      48,               # boogvorm-stappen (spantabel per stap); de leden zelf bewegen per pixelrij
+    "LID_CURVE_UP":    0.35,             # boog bovenlid: 0 = rechte rand, 1 = ooghoeken blijven dicht
+    "LID_CURVE_LOW":   0.20,             # boog onderlid
+    "LID_SKEW":        0.0,              # top van de boog verschuiven (-1..1, in halve breedtes)
+    "LID_SPLIT":       0.5,              # hoogte (0..1) waar de leden elkaar raken; 0.5 = symmetrisch
+
+    # Lokale knipper (getriggerd door de knipperteller in byte 12/13)
+    "BLINK_MS":        220,              # totale duur van een knipper
+    "BLINK_CLOSE":     0.30,             # deel van de duur voor het sluiten
+    "BLINK_HOLD":      0.08,             # deel van de duur helemaal dicht
+    "BLINK_SHAPE":     2.0,              # opengaan: hoger = eerst snel, dan langzaam uitlopen
+    "BLINK_DEPTH":     1.0,              # 1 = helemaal dicht, <1 = halve knipper
+    "BLINK_STEPS":     64,               # samples in de vooraf berekende curve
+
+    # Idle-leven (--life): saccades, drift en knipperen zolang de PLC-pose stilstaat
+    "LIFE_RATE":       1.0,              # schaal op alle gebeurtenisfrequenties
+    "LIFE_AMP":        0.06,             # uitslag als fractie van de kijkamplitude
+    "LIFE_SACCADE_HZ": 0.7,              # gem. micro-saccades per s
+    "LIFE_BLINK_HZ":   0.2,              # gem. spontane knipperingen per s
+    "LIFE_DRIFT_S":    2.5,              # gem. tijd tussen nieuwe driftdoelen (s)
+    "LIFE_DRIFT_SPEED": 0.6,             # driftsnelheid (eenheden LIFE_AMP per s)
+    "LIFE_QUIET_S":    1.5,              # zo lang moet de ontvangen pose stilstaan voor het aangaat
+    "LIFE_INPUT":      0.03,             # poseverschil (genormaliseerd) dat telt als nieuwe invoer
+    "LIFE_SEED":       None,             # None = elke start anders, getal = reproduceerbaar
+
+    # Expressie-presets (byte 14/15 kiest, byte 16/17 = overvloeitijd)
+    "EXPR_BLEND_STEP": 0.02,             # s per blend-byte (255 = 5.1 s); 0 = direct
 
     # Smoothing
     "SMOOTH_LOOK":     0.10,
     "SMOOTH_LID":      0.06,
     "SMOOTH_PUPIL":    0.12,
     "SMOOTH_IRIS":     0.20,             # hoe ‘traag’ iris-intensiteit meeloopt
+    "SMOOTH_ROT":      0.12,             # pupilkanteling
+    "SIM_HZ":          0,                # >0 = vaste simulatiestap (Hz), los van de framerate
+
+    # Idle: onder deze afwijkingen (t.o.v. doel) en snelheden telt het oog als stil
+    "IDLE_EPS_LOOK":   0.25,             # px
+    "IDLE_EPS_VEL":    1.0,              # px/s
+    "IDLE_EPS":        1e-3,             # lid / pupilschaal / iris (0..1-schaal)
+    "IDLE_POLL":       0.1,              # s; max. blokkeertijd (events blijven werken)
+    "LATCH_MARGIN":    0.003,            # s; late-latch: zoveel vóór de volgende flip klaar zijn
 }
 
 BG_COLOR   = CFG["BG"]
@@ -61,14 +238,27 @@ EYELID_COL = CFG["EYELID_COL"]
 def make_eye_base(w,h, iris_margin=20, strength=0.5):
     """
     strength 0..1: 0 = vlak/zwak, 1 = sterke gradient.
+    Met NumPy in één pass over het afstandsveld (via de palet-index), anders
+    de cirkel-lus.
+    """
+    if np is None:
+        return make_eye_base_circles(w,h, iris_margin, strength)
+
+    idx,(cx,cy) = make_iris_index(w,h, iris_margin)
+    idx.set_palette(iris_palette(strength))
+    return screen_format(idx),(cx,cy)
+
+def make_eye_base_circles(w,h, iris_margin=20, strength=0.5):
+    """
+    Oorspronkelijke generator: IRIS_STEPS gevulde cirkels van groot naar klein.
     """
-    base = pygame.Surface((w,h)).convert()
+    base = screen_format(pygame.Surface((w,h)))
     base.fill(BG_COLOR)
 
     cx, cy = w//2, h//2
     iris_r = min(w,h)//2 - iris_margin
 
-    grad = pygame.Surface((w,h), pygame.SRCALPHA).convert_alpha()
+    grad = screen_format(pygame.Surface((w,h), pygame.SRCALPHA), alpha=True)
     steps = max(8, int(CFG["IRIS_STEPS"]))
     # curve iets afhankelijk van strength: hoger = “hardere” overgang
     gamma = 1.0 + (1.5 - 1.5*strength)
@@ -87,7 +277,129 @@ def make_eye_base(w,h, iris_margin=20, strength=0.5):
                            iris_r - CFG["IRIS_RIM_W"]//2, CFG["IRIS_RIM_W"])
     return base,(cx,cy)
 
+# ---------- iris base (palet-geïndexeerd) ----------
+# Index 0..253 = gradientniveau (midden -> rand), 254 = irisrand, 255 = achtergrond.
+IRIS_IDX_RIM = 254
+IRIS_IDX_BG  = 255
+IRIS_LEVELS  = 254
+
+def iris_steps():
+    return max(8, min(IRIS_LEVELS, int(CFG["IRIS_STEPS"])))
+
+_IRIS_FIELDS = {}
+
+def iris_level_field(w,h, iris_margin=20):
+    """
+    (w,h) uint8-array met het gradientniveau per pixel (0..steps-1, 255 = buiten
+    de iris). Eén keer per resolutie/IRIS_STEPS berekend en daarna hergebruikt.
+    Niveau i-1 = kleinste cirkel met straal int(iris_r*i/steps) die de pixel
+    bevat, net als bij de cirkel-lus.
+    """
+    steps = iris_steps()
+    key = (w, h, iris_margin, steps)
+    field = _IRIS_FIELDS.get(key)
+    if field is None:
+        cx, cy = w//2, h//2
+        iris_r = min(w,h)//2 - iris_margin
+        dx = np.arange(w, dtype=np.float32) - cx
+        dy = np.arange(h, dtype=np.float32) - cy
+        r = np.sqrt(dx[:,None]**2 + dy[None,:]**2)
+        radii = (iris_r * np.arange(1, steps+1) / steps).astype(np.int32)
+        field = np.searchsorted(radii, r, side="left").astype(np.uint8)
+        field[r > radii[-1]] = IRIS_IDX_BG
+        _IRIS_FIELDS[key] = field
+    return field
+
+def make_iris_index(w,h, iris_margin=20):
+    """
+    8-bit surface met per pixel het gradientniveau (afstand tot het midden).
+    Wordt één keer per resolutie getekend; sterkte en kleuren zitten in het
+    palet (zie iris_palette), dus die wijzigen zonder hertekenen.
+    """
+    idx = pygame.Surface((w,h), 0, 8)
+    idx.set_palette(iris_palette(0.5))
+
+    cx, cy = w//2, h//2
+    iris_r = min(w,h)//2 - iris_margin
+    if np is not None:
+        pygame.surfarray.blit_array(idx, iris_level_field(w,h, iris_margin))
+    else:
+        idx.fill(IRIS_IDX_BG)
+        steps = iris_steps()
+        # zelfde volgorde als de cirkel-lus: groot -> klein, niveau i-1 hoort bij t=i/steps
+        for i in range(steps, 0, -1):
+            pygame.draw.circle(idx, i-1, (cx,cy), int(iris_r * i/steps))
+
+    if CFG["IRIS_RIM_W"] > 0:
+        pygame.draw.circle(idx, IRIS_IDX_RIM, (cx,cy),
+                           iris_r - CFG["IRIS_RIM_W"]//2, CFG["IRIS_RIM_W"])
+    return idx,(cx,cy)
+
+def iris_palette(strength):
+    """256 kleuren voor de indexsurface; zelfde curve als make_eye_base."""
+    steps = iris_steps()
+    gamma = 1.0 + (1.5 - 1.5*strength)
+    a, b = CFG["IRIS_A"], CFG["IRIS_B"]
+    pal = [BG_COLOR] * 256
+    for i in range(1, steps+1):
+        k = (i/steps)**gamma
+        pal[i-1] = tuple(int(a[c]*(1-k) + b[c]*k) for c in range(3))
+    pal[IRIS_IDX_RIM] = CFG["IRIS_RIM_COL"]
+    pal[IRIS_IDX_BG]  = BG_COLOR
+    return pal
+
+# ---------- glimlicht ----------
+def make_glint_surface(r, alpha=None):
+    """Zachte witte glimlichtvlek met straal r: alpha loopt van de rand naar het midden op."""
+    if alpha is None: alpha = CFG["GLINT_ALPHA"]
+    r = max(2, int(r))
+    surf = screen_format(pygame.Surface((2*r+2, 2*r+2), pygame.SRCALPHA), alpha=True)
+    steps = max(4, r // 2)
+    for i in range(steps, 0, -1):
+        t = i / steps                    # 1 = rand, klein = midden
+        pygame.draw.circle(surf, (255,255,255, int(alpha * (1.0 - t)**0.6)), (r+1, r+1), max(1, int(r*t)))
+    return surf
+
 # ---------- pupil surface ----------
+_UNIT_OUTLINES = {}
+
+def unit_superellipse(n, steps):
+    """
+    Eenheids-superellips |x|^n + |y|^n = 1 als steps+1 punten (gesloten),
+    één keer per (exponent, vertexaantal) berekend. NumPy-array of lijst.
+    """
+    key = (n, steps)
+    pts = _UNIT_OUTLINES.get(key)
+    if pts is None:
+        e = 2.0 / n
+        if np is not None:
+            t = np.arange(steps+1) * (math.tau / steps)
+            c, s = np.cos(t), np.sin(t)
+            pts = np.stack((np.sign(c) * np.abs(c)**e, np.sign(s) * np.abs(s)**e), axis=1)
+        else:
+            pts = []
+            for i in range(steps+1):
+                t = (i/steps)*math.tau
+                c = math.cos(t); s = math.sin(t)
+                pts.append((math.copysign(abs(c)**e, c), math.copysign(abs(s)**e, s)))
+        _UNIT_OUTLINES[key] = pts
+    return pts
+
+def superellipse_steps(a, b):
+    """Vertexaantal naar schermgrootte: ~1 per PUPIL_VERTEX_PX px omtrek."""
+    # omtrek ellips (Ramanujan) als benadering
+    h = ((a-b)/(a+b))**2 if a+b > 0 else 0.0
+    perim = math.pi*(a+b)*(1 + 3*h/(10 + math.sqrt(4 - 3*h)))
+    return int(clamp(perim / max(0.5, CFG["PUPIL_VERTEX_PX"]), 32, 400))
+
+def superellipse_points(cx, cy, a, b, n, steps=None):
+    """Gecachete eenheidsvorm geschaald (a,b) en verschoven naar (cx,cy)."""
+    if steps is None: steps = superellipse_steps(a, b)
+    unit = unit_superellipse(n, steps)
+    if np is not None:
+        return (unit * (a, b) + (cx, cy)).astype(np.int32).tolist()
+    return [(int(cx + x*a), int(cy + y*b)) for x,y in unit]
+
 def make_pupil_surface(pupil_w, pupil_h_half, edge=None):
     """
     Tekent een ‘tapered’ super-ellipse pupil met puntige uiteinden.
@@ -102,47 +414,789 @@ def make_pupil_surface(pupil_w, pupil_h_half, edge=None):
     pad = edge + 12
     W = pupil_w + pad*2
     H = full_h + pad*2
-    surf = pygame.Surface((W, H), pygame.SRCALPHA).convert_alpha()
+    surf = screen_format(pygame.Surface((W, H), pygame.SRCALPHA), alpha=True)
     cx, cy = W//2, H//2
 
     a = pupil_w / 2.0               # halve breedte
     b = full_h / 2.0                # halve hoogte
-    steps = 400                     # smooth
-
-    def superellipse_points(scale=1.0):
-        aa = a*scale
-        bb = b*scale
-        pts = []
-        for i in range(steps+1):
-            t = (i/steps)*math.tau
-            c = math.cos(t); s = math.sin(t)
-            x = math.copysign((abs(c)**(2.0/n))*aa, c)
-            y = math.copysign((abs(s)**(2.0/n))*bb, s)
-            pts.append((int(cx + x), int(cy + y)))
-        return pts
 
     min_axis = max(1.0, min(a, b))
     ring_scale = 1.0 + (edge + 6) / min_axis
 
-    outer = superellipse_points(scale=ring_scale) if edge > 0 else None
-    inner = superellipse_points(scale=1.0)
+    outer = superellipse_points(cx, cy, a*ring_scale, b*ring_scale, n) if edge > 0 else None
+    inner = superellipse_points(cx, cy, a, b, n)
 
     if edge > 0:
         pygame.gfxdraw.filled_polygon(surf, outer, CFG["PUPIL_EDGE_COL"])
-        pygame.gfxdraw.aapolygon(surf, outer, CFG["PUPIL_EDGE_COL"])
+        if CFG["PUPIL_AA"]: pygame.gfxdraw.aapolygon(surf, outer, CFG["PUPIL_EDGE_COL"])
 
     pygame.gfxdraw.filled_polygon(surf, inner, CFG["PUPIL_COL"])
-    pygame.gfxdraw.aapolygon(surf, inner, CFG["PUPIL_COL"])
+    if CFG["PUPIL_AA"]: pygame.gfxdraw.aapolygon(surf, inner, CFG["PUPIL_COL"])
 
     return surf
 
+class PupilBank:
+    """
+    Begrensde LRU-bank van pupil-sprites, sleutel = (breedte, halve hoogte, rand,
+    hoek) gekwantiseerd op CFG["PUPIL_QUANT"]. Met prebuild() wordt het hele
+    verwijdingsbereik (recht) vooraf getekend, zodat de frame-lus niet meer
+    rastert. Gedraaide sprites komen uit een vaste set die prebuild_rotated()
+    bij het opstarten met rotozoom maakt (-hoek = spiegelbeeld van +hoek);
+    hoek- en maatstap worden zo grof gekozen dat de set in PUPIL_ROT_MB past.
+    In de lus wordt alleen de dichtstbijzijnde voorgetekende hoek/maat
+    gekozen, nooit gedraaid. Met rle_target zijn alle sprites RLE-gecodeerd
+    (rle_sprite): ~1/3 van het geheugen, dus fijnere stappen in hetzelfde budget.
+    """
+    def __init__(self, budget_mb=None, quant=None, cache=None):
+        mb = CFG["PUPIL_BANK_MB"] if budget_mb is None else budget_mb
+        self.budget = int(mb * 1024 * 1024)
+        self.quant = max(1, int(CFG["PUPIL_QUANT"] if quant is None else quant))
+        self.cache = cache           # optioneel: AssetCache voor prebuild na herstart
+        self.sprites = OrderedDict()
+        self.bytes = 0
+        self.rot_budget = int(CFG["PUPIL_ROT_MB"] * 1024 * 1024)
+        self.rotated = {}            # vaste set gedraaide sprites: sleutel -> surface
+        self.rot_bytes = 0
+        self.rot_plan = None         # (base_pw, base_ph, edge, hoekstap, n hoeken, maatstap, lo, hi, tag)
+        self.rle_target = None       # vlak waar de sprites op komen (RLE-codering, zie rle_sprite); None = ruw
+        self.fill = None             # fractie zichtbare pixels van een pupil-sprite, één keer geteld
+        self.hits = self.misses = self.evictions = 0
+
+    def key(self, base_pw, base_ph, scale, edge, angle=0.0):
+        # kwantiseer op de halve hoogte (de snelst veranderende maat); breedte volgt.
+        # Vertexdichtheid en AA horen erbij, zodat kwaliteitsniveaus naast elkaar bestaan.
+        plan = self.rot_plan
+        if angle and plan is not None and plan[:3] == (base_pw, base_ph, edge):
+            _, _, _, astep, na, q, lo, hi, tag = plan
+            ia = max(-na, min(na, int(round(angle / astep))))
+            if ia:
+                i = max(lo, min(hi, int(round(scale / q))))
+                return (max(2, int(base_pw*i*q)), max(2, int(base_ph*i*q)), edge, ia*astep + 0.0) + tag
+        q = self.quant / float(base_ph)
+        s = round(scale / q) * q
+        return (max(2, int(base_pw*s)), max(2, int(base_ph*s)), edge, 0.0,
+                CFG["PUPIL_VERTEX_PX"], CFG["PUPIL_AA"])
+
+    def _render(self, key):
+        pw, ph, edge = key[:3]
+        build = lambda: make_pupil_surface(pw, ph, edge)
+        if self.cache is None:
+            return build()
+        return self.cache.get("pupil", (pw,ph), "BGRA", build, params=(edge,))
+
+    def _opaque(self, surf):
+        if self.fill is None:
+            self.fill = pygame.mask.from_surface(surf, 0).count() / float(surf.get_width() * surf.get_height())
+        return int(self.fill * surf.get_width() * surf.get_height())
+
+    def _build(self, key):
+        """Rechte sprite, RLE-gecodeerd als er een doelvlak is; geeft (surface, bytes)."""
+        surf = self._render(key)
+        if self.rle_target is None:
+            return rle_sprite(surf, None)
+        return rle_sprite(surf, self.rle_target, self._opaque(surf))
+
+    def _drop(self, key):
+        _, size = self.sprites.pop(key)
+        self.bytes -= size
+        self.evictions += 1
+
+    def _put(self, key, surf, size):
+        self.sprites[key] = (surf, size)
+        self.bytes += size
+        while self.bytes > self.budget and len(self.sprites) > 1:
+            self._drop(next(iter(self.sprites)))
+
+    def get(self, key):
+        if key[3]:
+            surf = self.rotated.get(key)
+            if surf is not None:
+                self.hits += 1
+                return surf
+            key = key[:3] + (0.0,) + key[4:]     # niet voorgetekend: recht, nooit rotozoom in de lus
+        hit = self.sprites.get(key)
+        if hit is not None:
+            self.sprites.move_to_end(key)
+            self.hits += 1
+            return hit[0]
+        self.misses += 1
+        t0 = time.perf_counter()
+        surf, size = self._build(key)
+        record_rebuild("pupil", time.perf_counter() - t0)
+        self._put(key, surf, size)
+        return surf
+
+    def _rot_plan(self, base_pw, base_ph, edge, min_scale, max_scale):
+        """
+        Hoek- en maatstap voor de gedraaide set. Vanaf de fijnste stappen
+        (PUPIL_ROT_QUANT, PUPIL_ROT_SIZE_Q) wordt van alle grovere combinaties
+        (hoeken gelijk verdeeld tot PUPIL_ROT_MAX, maatstap x2, x4, ...) de
+        grootte geschat (RLE: zichtbare pixels + regeloverhead, anders de
+        omsluitende rechthoek per hoek). Van wat in het budget
+        past wint de meest evenwichtige: hoogste min(hoekresolutie,
+        maatresolutie) t.o.v. de fijnste stappen, dan de meeste sprites.
+        """
+        amax = CFG["PUPIL_ROT_MAX"]
+        tag = (CFG["PUPIL_VERTEX_PX"], CFG["PUPIL_AA"])
+        na_max = int(math.ceil(amax / max(0.5, float(CFG["PUPIL_ROT_QUANT"])) - 1e-6)) if amax > 0 else 0
+        pad = 2 * (edge + 12)
+        fill = None                  # RLE: alleen de zichtbare pixels tellen (draaiing verandert die niet)
+        if self.rle_target is not None:
+            self._opaque(self._render((base_pw, base_ph, edge)))
+            fill = self.fill
+        best = None
+        m = max(1, int(CFG["PUPIL_ROT_SIZE_Q"]))
+        n_fine = None
+        while na_max and self.quant * m <= base_ph:
+            q = self.quant * m / float(base_ph)
+            lo, hi = int(math.ceil(min_scale / q)), int(math.floor(max_scale / q))
+            sizes = [(base_pw*i*q + pad, 2*base_ph*i*q + pad) for i in range(lo, hi + 1)]
+            n_fine = n_fine or max(1, len(sizes))
+            for na in range(na_max, 0, -1):
+                step = amax / na
+                est = 0
+                for ia in range(1, na + 1):
+                    t = math.radians(ia * step); c, sn = math.cos(t), math.sin(t)
+                    if fill is None:
+                        est += sum(2 * int(w*c + h*sn + 2) * int(w*sn + h*c + 2) * 4 for w, h in sizes)  # +/- hoek
+                    else:
+                        est += sum(2 * (int(fill*w*h) * 4 + int(w*sn + h*c + 2) * 8) for w, h in sizes)
+                if est <= self.rot_budget:
+                    score = (min(na / float(na_max), len(sizes) / float(n_fine)), na * len(sizes))
+                    if best is None or score > best[0]:
+                        best = (score, (base_pw, base_ph, edge, step, na, q, lo, max(lo, hi), tag))
+                    break                # minder hoeken bij deze maatstap geeft alleen minder sprites
+            m *= 2
+        if best is None:
+            return (base_pw, base_ph, edge, 0.0, 0, 1.0, 0, 0, tag)
+        return best[1]
+
+    def prebuild_rotated(self, base_pw, base_ph, min_scale, max_scale, edge):
+        """
+        Vaste gedraaide set voor deze basismaat tekenen (vervangt een vorige).
+        Stopt bij het budget; geeft het aantal sprites terug.
+        """
+        plan = self._rot_plan(base_pw, base_ph, edge, min_scale, max_scale)
+        self.rotated.clear(); self.rot_bytes = 0
+        self.rot_plan = plan
+        _, _, _, astep, na, q, lo, hi, tag = plan
+        if na == 0 or self.rot_budget <= 0:
+            self.rot_plan = None
+            return 0
+        t0 = time.perf_counter()
+        mid = (lo + hi) // 2
+        for i in sorted(range(lo, hi + 1), key=lambda i: abs(i - mid)):    # vanaf het midden naar buiten
+            pw, ph = max(2, int(base_pw*i*q)), max(2, int(base_ph*i*q))
+            upright = self._render((pw, ph, edge))
+            opaque = self._opaque(upright) if self.rle_target is not None else None
+            for ia in range(1, na + 1):
+                a = ia * astep + 0.0
+                pos = pygame.transform.rotozoom(upright, a, 1.0)
+                # de pupil is links-rechts symmetrisch: -hoek is het spiegelbeeld van +hoek
+                for surf in (pos, pygame.transform.flip(pos, True, False)):
+                    surf, size = rle_sprite(surf, self.rle_target, opaque, copy=False)
+                    if self.rot_bytes + size > self.rot_budget:
+                        record_rebuild("pupil_rot_set", time.perf_counter() - t0)
+                        return len(self.rotated)
+                    self.rotated[(pw, ph, edge, a) + tag] = surf
+                    self.rot_bytes += size
+                    a = -a
+        record_rebuild("pupil_rot_set", time.perf_counter() - t0)
+        return len(self.rotated)
+
+    def drop_other_quality(self):
+        """Sprites van een ander kwaliteitsniveau (vertexdichtheid/AA) weggooien."""
+        tag = (CFG["PUPIL_VERTEX_PX"], CFG["PUPIL_AA"])
+        for key in [k for k in self.sprites if k[4:] != tag]:
+            self._drop(key)
+
+    def prebuild(self, base_pw, base_ph, min_scale, max_scale, edge, around=1.0, limit=None):
+        """
+        Teken alle gekwantiseerde maten tussen min_scale en max_scale, vanaf
+        `around` naar buiten, tot het budget vol is (of `limit` sprites).
+        Geeft het aantal terug.
+        """
+        q = self.quant / float(base_ph)
+        lo, hi = int(math.floor(min_scale/q)), int(math.ceil(max_scale/q))
+        mid = int(round(around/q))
+        levels = sorted(range(lo, hi+1), key=lambda i: abs(i-mid))
+        n = 0
+        for i in levels:
+            key = self.key(base_pw, base_ph, i*q, edge)
+            if key in self.sprites:
+                continue
+            surf, size = self._build(key)
+            if self.bytes + size > self.budget:
+                break
+            self._put(key, surf, size)
+            n += 1
+            if limit is not None and n >= limit:
+                break
+        return n
+
+    def stats(self):
+        rot = ""
+        if self.rot_plan is not None:
+            rot = f", {self.rot_plan[3]:g} gr/{self.rot_plan[5]*self.rot_plan[1]:.0f} px"
+        return (f"pupil-bank {len(self.sprites)} sprites {self.bytes/1048576:.1f} MB "
+                f"(gedraaid {len(self.rotated)} sprites {self.rot_bytes/1048576:.1f} MB{rot}), "
+                f"{self.hits} hit / {self.misses} miss / {self.evictions} evict")
+
+def eyelid_cover(h, openness):
+    """Aantal pixelrijen dat elk ooglid (boven/onder) afdekt."""
+    return int(h*(1-openness)*0.5)
+
 def draw_eyelids(scr, openness):
     w,h = scr.get_size()
-    cover = int(h*(1-openness)*0.5)
+    cover = eyelid_cover(h, openness)
     if cover<=0: return
     pygame.draw.rect(scr, EYELID_COL, (0,0,w,cover))
     pygame.draw.rect(scr, EYELID_COL, (0,h-cover,w,cover))
 
+class EyelidShapes:
+    """
+    Gebogen oogleden. Per gekwantiseerde openheid ligt een spantabel klaar:
+    per lid een volle rechthoek plus de rijen van de boog, waarbij
+    opeenvolgende rijen met dezelfde spans tot één rect zijn samengevoegd.
+    "spans" tekent die rects met fill; "rle" zet de boog eenmalig in een
+    colorkey-sprite met RLEACCEL, dan is een lid één fill + één blit.
+    De tabel bepaalt alleen de vorm van de boog: de volle rechthoek en de
+    plaats van de boog volgen de exacte openheid (zie level()), dus de leden
+    bewegen per pixelrij en niet in stappen van h/2/LID_LEVELS.
+    """
+    def __init__(self, w, h):
+        self.w, self.h = w, h
+        self.mode = CFG["LID_MODE"]
+        self.levels = max(1, int(CFG["LID_LEVELS"]))
+        self.col = EYELID_COL
+        self.key = tuple(255 - c for c in self.col)    # colorkey, altijd anders dan de lidkleur
+        half = w / 2.0
+        px = half * (1.0 + CFG["LID_SKEW"])
+        self._s = [max(0.0, 1.0 - ((x + 0.5 - px) / half)**2) for x in range(w)]   # 1 op de top, 0 in de hoeken
+        self._smax = max(self._s)
+        self.tables = [self._table(i / float(self.levels)) for i in range(self.levels + 1)]
+        self.sprites = {}
+
+    def _edges(self, o, ss):
+        """Rand van boven- en onderlid (rij vanaf boven) bij openheid o, per boogpositie in ss."""
+        h = self.h
+        meet = h * clamp(CFG["LID_SPLIT"], 0.0, 1.0)
+        ku, kl = CFG["LID_CURVE_UP"], CFG["LID_CURVE_LOW"]
+        top = [int(meet - meet*o*(1.0 - ku*(1.0 - s))) for s in ss]
+        bot = [int(math.ceil(meet + (h - meet)*o*(1.0 - kl*(1.0 - s)))) for s in ss]
+        return top, bot
+
+    def level(self, openness):
+        """
+        Lidstand (stap, verschuiving bovenlid, verschuiving onderlid): de stap
+        kiest de boogvorm uit de tabel, de verschuivingen zetten de top van
+        elk lid op de exacte rij van deze openheid.
+        """
+        o = clamp(openness, 0.0, 1.0)
+        i = int(round(o * self.levels))
+        (top,), (bot,) = self._edges(o, (self._smax,))
+        up, low = self.tables[i]
+        return i, top - up[2], bot - low[3]
+
+    def _spans(self, edge):
+        """
+        Rijen y < edge[x] zijn bedekt; edge is eentoppig (laagst op de top).
+        Geeft (volle rect of None, boog-rects, eerste boogrij, eerste open rij).
+        """
+        w = self.w
+        y0, y1 = min(edge), max(edge)
+        pk = edge.index(y0)
+        left, right = edge[:pk], edge[pk:]
+        a, b = len(left), 0
+        rows = []                                  # [y, hoogte, a, b]
+        for y in range(y0, y1):
+            while a > 0 and left[a-1] <= y: a -= 1
+            while b < len(right) and right[b] <= y: b += 1
+            if rows and rows[-1][2] == a and rows[-1][3] == b:
+                rows[-1][1] += 1
+            else:
+                rows.append([y, 1, a, b])
+        band = []
+        for y, n, a, b in rows:
+            if a > 0: band.append(pygame.Rect(0, y, a, n))
+            if pk + b < w: band.append(pygame.Rect(pk + b, y, w - pk - b, n))
+        solid = pygame.Rect(0, 0, w, y0) if y0 > 0 else None
+        return solid, band, y0, y1
+
+    def _table(self, o):
+        """Spantabel voor openheid o: per lid (volle rect, boog-rects, (y0, y1))."""
+        h = self.h
+        top, bot = self._edges(o, self._s)
+        bot = [h - b for b in bot]
+        up = self._spans(top)
+        solid, band, y0, y1 = self._spans(bot)     # onderlid gespiegeld: rij y -> h-1-y
+        flip = lambda r: pygame.Rect(r.x, h - r.y - r.h, r.w, r.h)
+        low = (flip(solid) if solid else None, [flip(r) for r in band], h - y1, h - y0)
+        return up, low
+
+    def _placed(self, st):
+        """Per lid (volle rect of None, verschuiving, boog-rects, y0, y1) voor lidstand st."""
+        i, du, dl = st
+        (su, bu, u0, u1), (sl, bl, l0, l1) = self.tables[i]
+        top, bot = u0 + du, l1 + dl
+        return ((pygame.Rect(0, 0, self.w, top) if top > 0 else None, du, bu, u0 + du, u1 + du),
+                (pygame.Rect(0, bot, self.w, self.h - bot) if bot < self.h else None, dl, bl, l0 + dl, bot))
+
+    def bounds(self, st):
+        """Per lid de rijen (y0, y1) waarbinnen deze stand van een andere kan verschillen."""
+        return [(y0, y1) for _, _, _, y0, y1 in self._placed(st)]
+
+    def rects(self, st):
+        """Alle rects van beide leden (voor de texture-backend)."""
+        out = []
+        for solid, d, band, _, _ in self._placed(st):
+            if solid: out.append(solid)
+            out += [r.move(0, d) for r in band]
+        return out
+
+    def _sprite(self, level, lid):
+        k = (level, lid)
+        spr = self.sprites.get(k)
+        if spr is None:
+            t0 = time.perf_counter()
+            _, band, y0, y1 = self.tables[level][lid]
+            surf = pygame.Surface((self.w, max(1, y1 - y0)))
+            surf.fill(self.key)
+            for r in band:
+                surf.fill(self.col, r.move(0, -y0))
+            surf = screen_format(surf)
+            surf.set_colorkey(self.key, pygame.RLEACCEL)
+            spr = self.sprites[k] = (surf, y0)
+            record_rebuild("eyelid", time.perf_counter() - t0)
+        return spr
+
+    def paint(self, scr, st):
+        for lid, (solid, d, band, _, _) in enumerate(self._placed(st)):
+            if solid: scr.fill(self.col, solid)
+            if not band: continue
+            if self.mode == "rle":
+                surf, y = self._sprite(st[0], lid)
+                scr.blit(surf, (0, y + d))
+            else:
+                for r in band:
+                    scr.fill(self.col, r.move(0, d))
+
+_BLINK_PROFILES = {}
+
+def blink_profile():
+    """
+    Vooraf berekende knippercurve: (sluiting per sample 0..1, duur in s,
+    index van het laatste sluitsample). Sluiten met ease-in-out, kort dicht,
+    opengaan met een uitlopende macht (BLINK_SHAPE).
+    """
+    key = tuple(CFG[k] for k in ("BLINK_MS", "BLINK_CLOSE", "BLINK_HOLD", "BLINK_SHAPE",
+                                 "BLINK_DEPTH", "BLINK_STEPS"))
+    prof = _BLINK_PROFILES.get(key)
+    if prof is None:
+        ms, close, hold, shape, depth, n = key
+        n = max(4, int(n))
+        close = clamp(close, 0.01, 0.98); hold = clamp(hold, 0.0, 0.99 - close)
+        table = []
+        for i in range(n + 1):
+            p = i / float(n)
+            if p < close:
+                v = 0.5 - 0.5*math.cos(math.pi * p / close)
+            elif p < close + hold:
+                v = 1.0
+            else:
+                v = (1.0 - (p - close - hold) / (1.0 - close - hold)) ** shape
+            table.append(v * clamp(depth, 0.0, 1.0))
+        prof = _BLINK_PROFILES[key] = (table, max(0.01, ms / 1000.0), int(close * n))
+    return prof
+
+_LID_SHAPES = {}
+
+def eyelid_shapes(w, h):
+    """EyelidShapes per resolutie + lid-CFG, gedeeld door beide ogen en schaalwissels."""
+    key = (w, h, EYELID_COL) + tuple(CFG[k] for k in ("LID_MODE", "LID_LEVELS", "LID_CURVE_UP",
+                                                       "LID_CURVE_LOW", "LID_SKEW", "LID_SPLIT"))
+    shapes = _LID_SHAPES.get(key)
+    if shapes is None:
+        t0 = time.perf_counter()
+        shapes = _LID_SHAPES[key] = EyelidShapes(w, h)
+        record_rebuild("eyelid_spans", time.perf_counter() - t0)
+    return shapes
+
+# ---------- asset-cache op schijf ----------
+class AssetCache:
+    """
+    Gerenderde assets als ruwe pixelblobs in een cachemap. Sleutel = hash van
+    de CFG-sleutels die de pixels van dat asset bepalen (KEYS) + parameters
+    (resolutie e.d.) + pixelformaat van het scherm; lus-instellingen
+    (RENDER_SCALE, LIFE_*, smoothing, ...) tellen niet mee. Per asset en maat
+    blijven de VARIANTS laatst gebruikte varianten staan (bv. per
+    kwaliteitsniveau).
+    Laden = het bestand in één read in een eigen buffer en direct een surface
+    erop (frombuffer), dus na een herstart hoeft er niets opnieuw getekend te
+    worden. De buffer leeft zolang de surface; er blijft geen bestand open.
+    Afwijkende of kapotte bestanden worden weggegooid en opnieuw gebouwd.
+    """
+    MAGIC = b"KOAC"
+    VERSION = 1
+    HDR = struct.Struct("<4sHHII")   # magic, versie, reserve, breedte, hoogte
+    KEYS = {                         # asset -> CFG-sleutels die zijn pixels bepalen
+        "iris_index": ("IRIS_STEPS", "IRIS_RIM_W"),
+        "iris_base":  ("BG", "IRIS_A", "IRIS_B", "IRIS_RIM_W", "IRIS_RIM_COL", "IRIS_STEPS"),
+        "pupil":      ("PUPIL_TAPER", "PUPIL_EDGE_W", "PUPIL_EDGE_COL", "PUPIL_COL",
+                       "PUPIL_VERTEX_PX", "PUPIL_AA"),
+        "glint":      ("GLINT_R", "GLINT_ALPHA"),
+    }
+    VARIANTS = 4
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = self.misses = 0
+        self._warned = False
+        try:
+            os.makedirs(path, exist_ok=True)
+        except OSError as e:
+            print(f"[cache] kan {path} niet aanmaken: {e}")
+            self.path = None
+
+    def _file(self, name, size, fmt, params):
+        # size = parameter van het asset (bv. pupilmaat), niet per se de surfacemaat
+        scr = pygame.display.get_surface()
+        scr_fmt = (scr.get_bitsize(), scr.get_masks()) if scr else None
+        keys = self.KEYS.get(name) or sorted({k for ks in self.KEYS.values() for k in ks})
+        blob = json.dumps([self.VERSION, {k: CFG[k] for k in keys}, name, size, fmt, params, scr_fmt],
+                          sort_keys=True, default=str)
+        digest = hashlib.sha1(blob.encode()).hexdigest()[:16]
+        prefix = f"{name}-{size[0]}x{size[1]}-"
+        return prefix, os.path.join(self.path, prefix + digest + ".bin")
+
+    def _load(self, fn, fmt):
+        try:
+            with open(fn, "rb") as f:
+                buf = bytearray(os.fstat(f.fileno()).st_size)
+                n = f.readinto(buf)
+        except OSError:
+            return None
+        bpp = 1 if fmt == "P" else 4
+        try:
+            magic, ver, _, w, h = self.HDR.unpack_from(buf, 0)
+            ok = (magic == self.MAGIC and ver == self.VERSION
+                  and n == len(buf) == self.HDR.size + w*h*bpp)
+        except struct.error:
+            ok = False
+        if not ok:
+            print(f"[cache] verouderd/kapot, opnieuw bouwen: {os.path.basename(fn)}")
+            try: os.remove(fn)
+            except OSError: pass
+            return None
+        return pygame.image.frombuffer(memoryview(buf)[self.HDR.size:], (w,h), fmt)
+
+    def _store(self, prefix, fn, surf, fmt):
+        w, h = surf.get_size()
+        tmp = f"{fn}.{os.getpid()}.tmp"      # eigen naam per proces: het tweede oog schrijft tegelijk
+        try:
+            with open(tmp, "wb") as f:
+                f.write(self.HDR.pack(self.MAGIC, self.VERSION, 0, w, h))
+                f.write(pygame.image.tobytes(surf, fmt))
+            os.replace(tmp, fn)
+        except OSError as e:
+            try: os.remove(tmp)
+            except OSError: pass
+            if not self._warned:
+                print(f"[cache] schrijven mislukt ({e}); cache alleen-lezen")
+                self._warned = True
+            return
+        # varianten van hetzelfde asset (andere CFG) begrenzen: de minst recent gebruikte eruit.
+        # Een ander proces (tweede oog) kan tegelijk opruimen, dus fouten per bestand negeren.
+        def used(o):
+            try: return os.stat(o).st_mtime
+            except OSError: return 0.0
+        others = [os.path.join(self.path, o) for o in os.listdir(self.path)
+                  if o.startswith(prefix) and o.endswith(".bin")]
+        others.sort(key=used, reverse=True)
+        for old in others[self.VARIANTS:]:
+            try: os.remove(old)
+            except OSError: pass
+
+    def get(self, name, size, fmt, build, params=()):
+        """
+        Haal asset `name` op; bij een miss wordt build() aangeroepen en bewaard.
+        fmt: "P" (8-bit index) of "BGRA" (32-bit, zelfde volgorde als convert_alpha).
+        """
+        if self.path is None:
+            return build()
+        prefix, fn = self._file(name, size, fmt, params)
+        surf = self._load(fn, fmt)
+        if surf is not None:
+            self.hits += 1
+            try: os.utime(fn)           # mtime = laatst gebruikt, voor het opruimen
+            except OSError: pass
+            return surf
+        self.misses += 1
+        surf = build()
+        self._store(prefix, fn, surf, fmt)
+        return surf
+
+def default_cache_dir():
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "kattenoog")
+
+# ---------- expressie-presets ----------
+# Per preset doelen in pakketbytes (0..255); ontbrekende kanalen volgen de PLC.
+# Byte 0 = geen preset, 1 = eerste regel, enz. Vervangen met --expressions FILE.
+EXPRESSION_CHANNELS = ("x", "y", "lid", "pupil", "iris", "rot")
+EXPRESSIONS = [
+    ("slaperig",     {"lid": 170, "pupil": 70, "iris": 70}),
+    ("boos",         {"lid": 95, "pupil": 0, "iris": 235}),
+    ("nieuwsgierig", {"lid": 0, "pupil": 220, "iris": 190}),
+    ("bang",         {"lid": 0, "pupil": 255, "iris": 110}),
+    ("achterdochtig", {"lid": 120, "pupil": 40, "iris": 200, "rot": 150}),
+    ("dicht",        {"lid": 255}),
+]
+
+def expression(index):
+    """Preset voor expressiebyte index (dict kanaal -> byte), of None (0/onbekend)."""
+    return EXPRESSIONS[index-1][1] if 1 <= index <= len(EXPRESSIONS) else None
+
+def load_expressions(path):
+    """
+    Presettabel uit JSON: {"naam": {"lid": 170, "pupil": 70, ...}, ...}; de
+    volgorde bepaalt het bytenummer (1, 2, ...). Vervangt de ingebouwde tabel.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: verwacht een JSON-object naam -> kanalen")
+    table = []
+    for name, preset in data.items():
+        bad = sorted(set(preset) - set(EXPRESSION_CHANNELS))
+        if bad:
+            raise ValueError(f"{path}: expressie {name!r} heeft onbekende kanalen {bad}")
+        table.append((name, {k: int(clamp(v, 0, 255)) for k, v in preset.items()}))
+    if len(table) > 255:
+        raise ValueError(f"{path}: hooguit 255 expressies")
+    EXPRESSIONS[:] = table
+    return table
+
+# ---------- UDP ontvangst ----------
+def decode_packet(data):
+    """8, 10, 12, 14 of 18 bytes -> tuple met alle bytewaarden (langer = afgekapt), anders None."""
+    n = len(data)
+    if n >= 18: return struct.unpack("18B", data[:18])
+    if n >= 14: return struct.unpack("14B", data[:14])
+    if n >= 12: return struct.unpack("12B", data[:12])
+    if n >= 10: return struct.unpack("10B", data[:10])
+    if n >= 8:  return struct.unpack("8B", data[:8])
+    return None
+
+# Optionele volgnummer-header (plc_to_udp_bridge.py SEQ_HEADER): magic, seq u16, zendtijd ms u32
+SEQ_MAGIC = b"KOSQ"
+SEQ_HDR = struct.Struct("<4sHI")
+
+def split_seq_header(data):
+    """
+    -> (seq, zendtijd_ms, payload); zonder header (None, None, data). Alleen
+    als er na de header een geldig pakket (8, 10, 12, 14 of 18 bytes) overblijft.
+    """
+    if len(data) - SEQ_HDR.size in (8, 10, 12, 14, 18) and data[:4] == SEQ_MAGIC:
+        _, seq, t_ms = SEQ_HDR.unpack_from(data)
+        return seq, t_ms, data[SEQ_HDR.size:]
+    return None, None, data
+
+def eye_fields(vals, side):
+    """
+    Velden van één oog uit een gedecodeerd pakket:
+    (x, y, blink, pupil, iris|None, rot|None, knipperteller|None,
+    expressie|None, overvloeien|None).
+    """
+    o = 0 if side == "left" else 4
+    r = side != "left"
+    iris = vals[8 + r] if len(vals) >= 10 else None
+    rot = vals[10 + r] if len(vals) >= 12 else None
+    ev = vals[12 + r] if len(vals) >= 14 else None
+    expr, blend = (vals[14 + r], vals[16 + r]) if len(vals) >= 18 else (None, None)
+    return tuple(vals[o:o+4]) + (iris, rot, ev, expr, blend)
+
+# seq = volgnummer bij ontvangst, t = aankomsttijd (perf_counter), vals = decode_packet(),
+# sseq/st = volgnummer en zendtijd (ms) uit de optionele header
+Packet = namedtuple("Packet", "seq t vals sseq st", defaults=(None, None))
+
+class UdpReceiver:
+    """
+    Ontvangt oogpakketten. Met start() draait een eigen thread die de socket
+    continu leegt, anders leegt poll() hem vanuit de render-lus. Het nieuwste
+    pakket staat in een mailbox: één attribuut dat in zijn geheel vervangen
+    wordt (atomair onder de GIL), dus geen lock nodig.
+    Tellers: ontvangen, overschreven voordat ze gelezen zijn, ongeldig.
+    """
+    def __init__(self, port, host="0.0.0.0", seq_header=False):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.seq_header = seq_header  # alleen dan een KOSQ-header afsplitsen (een kaal pakket kan ook zo beginnen)
+        self.sock.bind((host, port))
+        self.sock.setblocking(False)
+        self.latest = None
+        self.received = self.coalesced = self.malformed = 0
+        self._seq = 0
+        self._taken = 0
+        self._thread = None
+        self._stop = False
+        self.wake = threading.Event()
+        self.queue = None            # deque: alle pakketten bewaren (jitterbuffer)
+
+    def keep_all(self):
+        """Naast de mailbox ook elk pakket in self.queue zetten."""
+        self.queue = deque(maxlen=256)
+        return self
+
+    def _handle(self, data, t):
+        sseq, st = None, None
+        if self.seq_header:
+            sseq, st, data = split_seq_header(data)
+        vals = decode_packet(data)
+        if vals is None:
+            self.malformed += 1
+            return
+        self._seq += 1
+        self.received += 1
+        if self.latest is not None and self.latest.seq != self._taken:
+            self.coalesced += 1
+        pkt = Packet(self._seq, t, vals, sseq, st)
+        if self.queue is not None:
+            self.queue.append(pkt)
+        self.latest = pkt
+        self.wake.set()
+
+    def poll(self):
+        """Inline-modus: socket leeglezen (niet blokkerend)."""
+        try:
+            while True:
+                data, _ = self.sock.recvfrom(64)
+                self._handle(data, time.perf_counter())
+        except BlockingIOError:
+            pass
+
+    def _run(self):
+        self.sock.settimeout(0.5)
+        while not self._stop:
+            try:
+                data, _ = self.sock.recvfrom(64)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self._handle(data, time.perf_counter())
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="udp-rx", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop = True
+        if self._thread is not None:
+            self._thread.join(1.0)
+        self.sock.close()
+
+    def take(self):
+        """Nieuwste nog niet gelezen pakket, of None."""
+        if self._thread is None:
+            self.poll()
+        self.wake.clear()
+        p = self.latest
+        if p is None or p.seq == self._taken:
+            return None
+        self._taken = p.seq
+        return p
+
+    def wait(self, timeout):
+        """Blokkeer tot er een pakket binnenkomt (of timeout)."""
+        if self._thread is None:
+            select.select([self.sock], [], [], timeout)
+        else:
+            self.wake.wait(timeout)
+
+    def stats(self):
+        return f"udp {self.received} ontvangen / {self.coalesced} overschreven / {self.malformed} ongeldig"
+
+# ---------- jitterbuffer ----------
+INTERP_FIELDS = 12           # bytes 0..11 (kijk/lid/pupil/iris/rot) worden geïnterpoleerd, tellers/presets niet
+
+class JitterBuffer:
+    """
+    Vangt de zweving tussen de 50 Hz PLC-setpoints en de schermfrequentie op.
+    Pakketten worden geordend op zendtijd (header, omgerekend naar de lokale
+    klok) of anders aankomsttijd, en sample(now) geeft de doelen lineair
+    geïnterpoleerd op tijdstip now - delay. Telt diepte, underruns en
+    pakketten die te laat (of dubbel) kwamen. source_t = aankomsttijd van het
+    nieuwste pakket dat in de laatste sample meetelt (voor de pakketleeftijd).
+    """
+    def __init__(self, delay, maxlen=64):
+        self.delay = delay
+        self.maxlen = maxlen
+        self.buf = []                # [(tijd, sseq, vals, aankomst)] oplopend in tijd
+        self.source_t = None
+        self._offsets = deque(maxlen=64)
+        self._ms_base = None; self._ms_last = None
+        self.underruns = self.late = 0
+        self._underrun = False
+        self._played = float("-inf")
+        self._depth_sum = 0; self._depth_n = 0
+
+    def _local_time(self, pkt):
+        if pkt.st is None:
+            return pkt.t
+        # u32 ms-teller uitpakken (wrap na ~49 dagen)
+        if self._ms_last is not None and pkt.st < self._ms_last - 0x80000000:
+            self._ms_base = (self._ms_base or 0) + 0x100000000
+        self._ms_last = pkt.st
+        ts = ((self._ms_base or 0) + pkt.st) / 1000.0
+        # klokverschil = kleinste (aankomst - zendtijd) van de laatste pakketten
+        self._offsets.append(pkt.t - ts)
+        return ts + min(self._offsets)
+
+    def push(self, pkt):
+        t = self._local_time(pkt)
+        if t <= self._played or any(pkt.sseq is not None and pkt.sseq == e[1] for e in self.buf):
+            self.late += 1
+            return
+        i = len(self.buf)
+        while i > 0 and self.buf[i-1][0] > t:
+            i -= 1
+        self.buf.insert(i, (t, pkt.sseq, pkt.vals, pkt.t))
+        if len(self.buf) > self.maxlen:
+            del self.buf[0]
+
+    def sample(self, now):
+        """Geïnterpoleerde waarden op now - delay, of None als de buffer leeg is."""
+        if not self.buf:
+            return None
+        tp = now - self.delay
+        while len(self.buf) >= 2 and self.buf[1][0] <= tp:
+            del self.buf[0]
+        self._depth_sum += sum(1 for e in self.buf if e[0] > tp); self._depth_n += 1
+        t0, _, v0, arr0 = self.buf[0]
+        if tp <= t0 or len(self.buf) == 1:
+            if tp > t0 and not self._underrun:
+                self.underruns += 1      # nieuwste pakket is al gespeeld: vasthouden
+            self._underrun = tp > t0
+            self._played = max(self._played, min(tp, t0))
+            self.source_t = arr0
+            return v0
+        self._underrun = False
+        t1, _, v1, self.source_t = self.buf[1]
+        a = (tp - t0) / (t1 - t0) if t1 > t0 else 1.0
+        self._played = tp
+        n = min(len(v0), len(v1))
+        return tuple(v0[i] + (v1[i]-v0[i])*a if i < INTERP_FIELDS else v0[i] for i in range(n))
+
+    def pending(self, now):
+        """Staan er nog pakketten klaar die nog niet gespeeld zijn?"""
+        return bool(self.buf) and self.buf[-1][0] > now - self.delay
+
+    def stats(self):
+        depth = self._depth_sum / max(1, self._depth_n)
+        return (f"jitter {self.delay*1000:.0f} ms: diepte gem {depth:.1f}, "
+                f"{self.underruns} underruns, {self.late} te laat/dubbel")
+
 # ---------- monitor helpers ----------
 def get_desktops():
     try:
@@ -152,10 +1206,13 @@ def get_desktops():
     except Exception:
         return [(1080,1080)]
 
-def choose_driver():
+def choose_driver(headless=False):
     # Pi: probeer KMSDRM als er geen X11 DISPLAY is, anders x11
     if "SDL_VIDEODRIVER" in os.environ:
         return
+    if headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"   # benchmark zonder scherm
+        return
     if os.environ.get("XDG_RUNTIME_DIR") and not os.environ.get("DISPLAY"):
         os.environ["SDL_VIDEODRIVER"] = "kmsdrm"
     else:
@@ -179,20 +1236,81 @@ def open_window_on_monitor(monitor, width, height, vsync=True, fullscreen=True):
     pygame.event.set_grab(True)
     return screen
 
+def open_texture_window(monitor, width, height, fullscreen=True, title="Kattenoog"):
+    """
+    Venster zonder display-surface, voor de texture-backend (SDL2 Renderer).
+    Geplaatst op display-index `monitor` (SDL_WINDOWPOS_CENTERED_DISPLAY), dus
+    ook onder kmsdrm, waar monitoren geen gezamenlijk bureaublad vormen.
+    """
+    from pygame._sdl2.video import Window
+    pygame.display.init()
+    monitor = max(0, min(monitor, pygame.display.get_num_displays()-1))
+    pos = 0x2FFF0000 | monitor
+    window = Window(title, size=(width, height), position=(pos, pos),
+                    borderless=True, fullscreen_desktop=fullscreen)
+    pygame.mouse.set_visible(False)
+    return window
+
 # ---------- oog ----------
 class Eye:
-    def __init__(self, screen, width, height, ampx=240, ampy=140):
+    def __init__(self, screen, width, height, ampx=240, ampy=140, cache=None, pupils=None, sim_hz=None):
         self.scr=screen; self.w=width; self.h=height
+        self.cache=cache
+        self.pupils = pupils if pupils is not None else PupilBank(cache=cache)
         # iris-sterkte (0..1)
         self.iris_strength = 0.5
         self.iris_strength_target = 0.5
         self.iris_v = 0.0
         self._last_iris_strength = None
+        self._palette = None
+        self.iris_mode = CFG["IRIS_MODE"]
 
-        self.base,(self.cx,self.cy)=make_eye_base(width,height, strength=self.iris_strength)
         self.ampx=ampx; self.ampy=ampy
         self.look_x=self.look_y=0.0; self.vx=self.vy=0.0
         self.smooth=CFG["SMOOTH_LOOK"]; self.maxspeed=2000
+        self.expr=0; self._blend_from=None   # actieve expressie-preset; overvloeien: doelen bij de start
+        self.scale=1.0; self.scale_target=1.0; self.sv=0.0
+        self.min_scale=0.6; self.max_scale=1.8
+        self.rot=0.0; self.rot_target=0.0; self.rot_v=0.0     # pupilkanteling (graden)
+        self.pupil_from_bank=True    # False = presenter haalt zelf rechte sprites (texture-backend)
+        self.blink_t=None; self._blink_ev=None    # lokale knipper: tijd sinds start, laatste teller
+        self.in_tx=self.in_ty=0.0    # kijkdoel zoals ontvangen (tx/ty kan er idle-leven bovenop hebben)
+        self._setup_geometry()
+        self.openness=1.0
+        self._drawn_prect=None; self._drawn_cover=None; self._base_dirty=True
+        # late-latch: callable die vlak voor de pupil-blit het nieuwste pakket
+        # toepast (True = nieuwe doelen); packet_t = aankomsttijd nog niet getoond pakket
+        self.late_latch=None; self.packet_t=None
+        self._look_prev=(0.0,0.0,0.0,0.0); self._last_dt=0.0
+        self.tx=self.ty=0.0
+        self.open_target=1.0
+
+        # vaste simulatiestap (0 = stap met de frametijd) + getoonde waarden
+        hz = CFG["SIM_HZ"] if sim_hz is None else sim_hz
+        self.sim_dt = 1.0/hz if hz and hz > 0 else 0.0
+        self._acc = 0.0; self._alpha = 1.0
+        self._prev_state = None
+        self._update_view()
+
+    def _setup_geometry(self):
+        """Alles wat van de resolutie afhangt: iris-base en pupil-basismaat."""
+        self.cx, self.cy = self.w//2, self.h//2
+        # irislaag met rand zodat hij met parallax kan schuiven zonder randen bloot te geven
+        self.iris_pad = int(math.ceil(max(abs(self.ampx), abs(self.ampy)) * abs(CFG["PARALLAX_IRIS"])))
+        self.base = self._build_base(self.iris_strength, cached=True)
+        self.iris_off = (-self.iris_pad, -self.iris_pad)
+        self._drawn_iris_off = None
+        self._drawn_glint = None
+        self.glint = None
+        if CFG["GLINT"]:
+            iris_r = min(self.w, self.h)//2 - 20
+            r = max(2, int(iris_r * CFG["GLINT_R"]))
+            self.glint = self._cached("glint", (r, r), "BGRA", lambda: make_glint_surface(r),
+                                      params=(CFG["GLINT_ALPHA"],))
+            gx, gy = CFG["GLINT_POS"]
+            self.glint_rect = self.glint.get_rect(center=(int(self.cx + gx*iris_r), int(self.cy + gy*iris_r)))
+            self._glint_home = self.glint_rect.center
+        self.lids = eyelid_shapes(self.w, self.h) if CFG["LID_MODE"] != "rect" else None
 
         # Pupil basisgrootte uit % van scherm
         base_pw = max(16, int(self.w * CFG["PUPIL_W_PCT"] / 100.0))
@@ -200,121 +1318,1629 @@ class Eye:
         base_ph = max(8, full_ph // 2)  # halve hoogte intern
 
         self.base_pw=base_pw; self.base_ph=base_ph
-        self.scale=1.0; self.scale_target=1.0; self.sv=0.0
-        self.min_scale=0.6; self.max_scale=1.8
-        self.cur_pw=int(base_pw); self.cur_ph=int(base_ph)
-        self.pupil=make_pupil_surface(self.cur_pw, self.cur_ph, CFG["PUPIL_EDGE_W"])
+        self.pupil_key=self.pupils.key(base_pw, base_ph, self.scale, CFG["PUPIL_EDGE_W"], self.rot)
+        self.pupil=self.pupils.get(self.pupil_key)
         self.prect=self.pupil.get_rect(center=(self.cx,self.cy))
-        self.openness=1.0
-        self.tx=self.ty=0.0
-        self.open_target=1.0
 
-    def set_targets_from_bytes(self, bx, by, bblink, bpupil, biris=None):
+    def _build_base(self, strength, cached=False):
+        """Irislaag (index of RGB) op schermmaat + 2x iris_pad, iris zelfde straal."""
+        p = self.iris_pad
+        W, H, m = self.w + 2*p, self.h + 2*p, 20 + p
+        if self.iris_mode == "palette":
+            return self._cached("iris_index", (W,H), "P", lambda: make_iris_index(W,H, m)[0], params=(m,))
+        if cached:
+            base = self._cached("iris_base", (W,H), "BGRA", lambda: make_eye_base(W,H, m, strength=strength)[0],
+                                params=(strength, m))
+        else:
+            base = make_eye_base(W,H, m, strength=strength)[0]
+        return screen_format(base)
+
+    def resize(self, screen):
+        """
+        Naar een andere (interne) resolutie: assets opnieuw opbouwen en alle
+        pixelgrootheden (amplitude, kijkpositie, snelheid) meeschalen.
+        """
+        w, h = screen.get_size()
+        r = w / float(self.w)
+        self.scr = screen; self.w, self.h = w, h
+        if self.pupils.rle_target is not None:
+            self.pupils.rle_target = screen.get_abs_parent()
+        self.ampx *= r; self.ampy *= r; self.maxspeed *= r
+        self.look_x *= r; self.look_y *= r; self.vx *= r; self.vy *= r
+        self.tx *= r; self.ty *= r; self.in_tx *= r; self.in_ty *= r
+        lx, vx, ly, vy = self._look_prev
+        self._look_prev = (lx*r, vx*r, ly*r, vy*r)
+        if self._prev_state is not None:
+            x, y, o, sc, ir, rot = self._prev_state
+            self._prev_state = (x*r, y*r, o, sc, ir, rot)
+        self._setup_geometry()
+        self.refresh_iris()
+        self._drawn_prect = None; self._base_dirty = True
+        self._update_view()
+
+    def prebuild_pupils(self, limit=None):
+        """
+        Rechte sprites rond de huidige maat en, als die nog niet bij deze
+        basismaat hoort, de vaste gedraaide set (zie PupilBank.prebuild_rotated).
+        Die laatste niet als de presenter zelf draait (texture-backend).
+        """
+        edge = CFG["PUPIL_EDGE_W"]
+        n = self.pupils.prebuild(self.base_pw, self.base_ph, self.min_scale, self.max_scale,
+                                 edge, around=self.scale, limit=limit)
+        plan = self.pupils.rot_plan
+        if self.pupil_from_bank and (plan is None or plan[:3] != (self.base_pw, self.base_ph, edge)):
+            self.pupils.prebuild_rotated(self.base_pw, self.base_ph, self.min_scale, self.max_scale, edge)
+        if limit is None:
+            trim_heap()              # ruwe en rotozoom-buffers zijn vrij; anders blijft de RSS hoog
+        return n
+
+    def _cached(self, name, size, fmt, build, params=()):
+        if self.cache is None:
+            return build()
+        return self.cache.get(name, size, fmt, build, params)
+
+    def set_targets_from_bytes(self, bx, by, bblink, bpupil, biris=None, brot=None, bevent=None,
+                               bexpr=None, bblend=None):
+        if bexpr is not None:
+            self.set_expression(bexpr, bblend or 0)
+            preset = expression(bexpr)
+            if preset:
+                bx, by = preset.get("x", bx), preset.get("y", by)
+                bblink, bpupil = preset.get("lid", bblink), preset.get("pupil", bpupil)
+                biris, brot = preset.get("iris", biris), preset.get("rot", brot)
         # 0..255 -> -1..+1 -> pixels
         ax = (bx/255.0)*2.0 - 1.0
         ay = (by/255.0)*2.0 - 1.0
-        self.tx = ax*self.ampx
-        self.ty = ay*self.ampy
+        self.tx = self.in_tx = ax*self.ampx
+        self.ty = self.in_ty = ay*self.ampy
         self.open_target = 1.0 - (bblink/255.0)
         self.scale_target = self.min_scale + (self.max_scale - self.min_scale)*(bpupil/255.0)
         if biris is not None:
             self.iris_strength_target = biris/255.0
+        if brot is not None:
+            self.rot_target = ((brot/255.0)*2.0 - 1.0) * CFG["PUPIL_ROT_MAX"]
+        if self._blend_from is not None:
+            # nieuwe eindwaarden onthouden, het doel blijft op de overvloeicurve
+            self._blend_to = {attr: getattr(self, attr) for attr in self._blend_from}
+            self._apply_blend()
+        if bevent is not None:
+            # knipperteller: elke verandering = één lokale knipper (het eerste pakket zet alleen de teller)
+            if self._blink_ev is not None and bevent != self._blink_ev:
+                self.trigger_blink()
+            self._blink_ev = bevent
 
-    def update(self, dt):
+    # expressiekanaal -> doel-attribuut
+    _EXPR_TARGET = {"x": "tx", "y": "ty", "lid": "open_target", "pupil": "scale_target",
+                    "iris": "iris_strength_target", "rot": "rot_target"}
+
+    def set_expression(self, index, bblend=0):
+        """
+        Naar expressie-preset index (0 = terug naar de PLC-waarden). De doelen
+        van de kanalen van de oude en nieuwe preset schuiven in bblend x
+        EXPR_BLEND_STEP s (smoothstep) van hun huidige waarde naar de nieuwe;
+        de gewone smoothing volgt. bblend 0 = direct, zoals een PLC-sprong.
+        """
+        if index == self.expr:
+            return
+        chans = set(expression(self.expr) or ()) | set(expression(index) or ())
+        self.expr = index
+        dur = bblend * CFG["EXPR_BLEND_STEP"]
+        if dur <= 0 or not chans:
+            self._blend_from = None
+            return
+        self._blend_from = {self._EXPR_TARGET[ch]: getattr(self, self._EXPR_TARGET[ch]) for ch in chans}
+        self._blend_to = dict(self._blend_from)
+        self._blend_t = 0.0; self._blend_dur = dur
+
+    def _apply_blend(self):
+        a = clamp(self._blend_t / self._blend_dur, 0.0, 1.0)
+        a = a*a*(3.0 - 2.0*a)
+        for attr, v0 in self._blend_from.items():
+            setattr(self, attr, v0 + (self._blend_to[attr] - v0) * a)
+        if self._blend_t >= self._blend_dur:
+            self._blend_from = None
+
+    def trigger_blink(self):
+        """
+        Start een knipper uit blink_profile(). Tijdens het opengaan van een
+        vorige knipper verder vanaf dezelfde sluiting op de sluitflank, zodat
+        het lid niet terugspringt; sluitend of dicht: negeren.
+        """
+        table, dur, ic = blink_profile()
+        if self.blink_t is None:
+            self.blink_t = 0.0
+            return
+        n = len(table) - 1
+        if self.blink_t / dur * n <= ic:
+            return
+        v = self.blink_closure()
+        i = 0
+        while i < ic and table[i+1] <= v:
+            i += 1
+        lo, hi = table[i], table[min(i+1, ic)]
+        f = (v - lo) / (hi - lo) if hi > lo else 0.0
+        self.blink_t = (i + clamp(f, 0.0, 1.0)) / n * dur
+
+    def blink_closure(self):
+        """Huidige knippersluiting 0..1 (lineair geïnterpoleerd in de tabel)."""
+        if self.blink_t is None:
+            return 0.0
+        table, dur, _ = blink_profile()
+        f = self.blink_t / dur * (len(table) - 1)
+        i = int(f)
+        if i >= len(table) - 1:
+            return table[-1]
+        return table[i] + (table[i+1] - table[i]) * (f - i)
+
+    def _step_blink(self, dt):
+        if self.blink_t is not None:
+            self.blink_t += dt
+            if self.blink_t >= blink_profile()[1]:
+                self.blink_t = None
+
+    def _sim_state(self):
+        o = self.openness
+        if self.blink_t is not None:
+            o *= 1.0 - self.blink_closure()
+        return (self.look_x, self.look_y, o, self.scale, self.iris_strength, self.rot)
+
+    def _update_view(self):
+        """Getoonde waarden: simulatietoestand, of bij vaste stap geïnterpoleerd."""
+        cur = self._sim_state()
+        if self.sim_dt and self._prev_state is not None:
+            a = self._alpha
+            cur = tuple(p + (c-p)*a for p,c in zip(self._prev_state, cur))
+        self.draw_x, self.draw_y, self.draw_open, self.draw_scale, self.draw_iris, self.draw_rot = cur
+
+    def step(self, dt):
+        """Eén smoothing-stap van alle kanalen."""
+        self._look_prev = (self.look_x, self.vx, self.look_y, self.vy)
+        self._last_dt = dt
         self.look_x,self.vx = smooth_damp(self.look_x, self.tx, self.vx, self.smooth, dt, self.maxspeed)
         self.look_y,self.vy = smooth_damp(self.look_y, self.ty, self.vy, self.smooth, dt, self.maxspeed)
         self.openness,_     = smooth_damp(self.openness, self.open_target, 0.0, CFG["SMOOTH_LID"], dt, 99)
         self.scale,self.sv  = smooth_damp(self.scale, self.scale_target, self.sv, CFG["SMOOTH_PUPIL"], dt, 10)
         self.iris_strength,self.iris_v = smooth_damp(self.iris_strength, self.iris_strength_target,
                                                      self.iris_v, CFG["SMOOTH_IRIS"], dt, 10)
+        self.rot,self.rot_v = smooth_damp(self.rot, self.rot_target, self.rot_v, CFG["SMOOTH_ROT"], dt, 360)
+
+    def update(self, dt):
+        """
+        Zonder sim_hz één stap met de frametijd (begrensd op 0.5..50 ms). Met
+        sim_hz vaste stappen van 1/sim_hz uit een accumulator, zodat de beweging
+        niet van de framerate afhangt; getoond wordt tussen de laatste twee
+        stappen geïnterpoleerd.
+        """
+        n, sdt = self._sim_steps(dt)
+        for _ in range(n):
+            if self.sim_dt:
+                self._prev_state = self._sim_state()
+            self.step(sdt)
+            self._step_blink(sdt)
+        self._after_steps(dt if self.sim_dt else sdt)
+
+    def _sim_steps(self, dt):
+        """Aantal en grootte van de stappen voor deze frametijd; werkt de accumulator bij."""
+        if not self.sim_dt:
+            return 1, clamp(dt, 0.0005, 0.05)
+        self._acc += min(max(0.0, dt), 0.25)
+        n = 0
+        while self._acc >= self.sim_dt:
+            self._acc -= self.sim_dt
+            n += 1
+        self._alpha = self._acc / self.sim_dt
+        return n, self.sim_dt
+
+    def _after_steps(self, dt):
+        """Rest van update() na de smoothing-stappen: blend, weergave, pupil en iris."""
+        if self._blend_from is not None:
+            self._blend_t += dt
+            self._apply_blend()
+        self._update_view()
 
-        # Rebuild pupil als grootte wijzigt
-        desired_pw=int(self.base_pw*self.scale)
-        desired_ph=int(self.base_ph*self.scale)
-        if abs(desired_pw-self.cur_pw)>=2 or abs(desired_ph-self.cur_ph)>=2:
-            self.cur_pw, self.cur_ph = desired_pw, desired_ph
-            self.pupil = make_pupil_surface(self.cur_pw, self.cur_ph, CFG["PUPIL_EDGE_W"])
+        # Pupil-sprite uit de bank als de (gekwantiseerde) grootte wijzigt
+        key = self.pupils.key(self.base_pw, self.base_ph, self.draw_scale, CFG["PUPIL_EDGE_W"], self.draw_rot)
+        if self.pupil_from_bank and key != self.pupil_key:
+            self.pupil_key = key
+            self.pupil = self.pupils.get(key)
             self.prect = self.pupil.get_rect(center=(self.cx,self.cy))
 
+        # Palet-modus: alleen het palet herschrijven (256 kleuren), geen drempel nodig
+        iris = self.draw_iris
+        if self.iris_mode == "palette":
+            if iris != self._last_iris_strength:
+                t0 = time.perf_counter()
+                pal = iris_palette(iris)
+                if pal != self._palette:
+                    self.base.set_palette(pal)
+                    self._palette = pal
+                    self._base_dirty = True
+                    record_rebuild("iris_palette", time.perf_counter() - t0)
+                self._last_iris_strength = iris
         # Rebuild iris/achtergrond als sterkte zichtbaar wijzigt
-        if (self._last_iris_strength is None) or (abs(self.iris_strength - self._last_iris_strength) > 0.02):
-            self.base,(self.cx,self.cy) = make_eye_base(self.w, self.h, strength=self.iris_strength)
-            self._last_iris_strength = self.iris_strength
+        elif (self._last_iris_strength is None) or (abs(iris - self._last_iris_strength) > CFG["IRIS_REBUILD_EPS"]):
+            t0 = time.perf_counter()
+            self.base = self._build_base(iris)
+            record_rebuild("iris_base", time.perf_counter() - t0)
+            self._last_iris_strength = iris
+            self._base_dirty = True
 
-    def draw(self):
-        self.scr.blit(self.base,(0,0))
-        self.prect.center=(int(self.cx+self.look_x), int(self.cy+self.look_y))
+    def relatch(self):
+        """
+        Late-latch: nieuwste pakket ophalen en, als er een is, de kijkstap van
+        dit frame opnieuw doen vanaf de toestand vóór update() met het nieuwe doel.
+        """
+        if self.late_latch is None or not self.late_latch():
+            return False
+        lx, vx, ly, vy = self._look_prev
+        dt = self._last_dt
+        self.look_x,self.vx = smooth_damp(lx, self.tx, vx, self.smooth, dt, self.maxspeed)
+        self.look_y,self.vy = smooth_damp(ly, self.ty, vy, self.smooth, dt, self.maxspeed)
+        self._update_view()
+        return True
+
+    def settled(self):
+        """
+        True als alle smooth_damp-kanalen hun doel bereikt hebben en er niets
+        meer te hertekenen valt. Zet de waarden dan exact op het doel.
+        """
+        el, ev, e = CFG["IDLE_EPS_LOOK"], CFG["IDLE_EPS_VEL"], CFG["IDLE_EPS"]
+        if (self.blink_t is not None or self._blend_from is not None or abs(self.look_x-self.tx) > el or abs(self.look_y-self.ty) > el
+                or abs(self.vx) > ev or abs(self.vy) > ev
+                or abs(self.openness-self.open_target) > e
+                or abs(self.scale-self.scale_target) > e or abs(self.sv) > e
+                or abs(self.iris_strength-self.iris_strength_target) > e or abs(self.iris_v) > e
+                or abs(self.rot-self.rot_target) > el or abs(self.rot_v) > ev):
+            return False
+        self.look_x, self.look_y, self.vx, self.vy = self.tx, self.ty, 0.0, 0.0
+        self.openness = self.open_target
+        self.scale, self.sv = self.scale_target, 0.0
+        self.iris_strength, self.iris_v = self.iris_strength_target, 0.0
+        self.rot, self.rot_v = self.rot_target, 0.0
+        self._prev_state = self._sim_state()
+        self._update_view()
+        return True
+
+    def refresh_iris(self):
+        """Na wijziging van IRIS_A/IRIS_B/BG in CFG: iris opnieuw inkleuren."""
+        self._last_iris_strength = None
+        self._palette = None
+
+    def apply_quality(self):
+        """
+        Na wijziging van kwaliteitsinstellingen in CFG (IRIS_STEPS e.d.): de
+        iris-index opnieuw opbouwen en de pupil-bank rond de huidige maat
+        vullen op het nieuwe niveau (de rest volgt via de LRU).
+        """
+        self.pupils.drop_other_quality()
+        self.prebuild_pupils(limit=CFG["QUALITY_PREBUILD"])
+        if self.iris_mode == "palette":
+            t0 = time.perf_counter()
+            self.base = self._build_base(self.iris_strength)
+            record_rebuild("iris_index", time.perf_counter() - t0)
+        self.refresh_iris()
+        self._base_dirty = True
+
+    def _paint(self, cover):
+        self.scr.blit(self.base, self.iris_off)
         self.scr.blit(self.pupil, self.prect)
-        draw_eyelids(self.scr, clamp(self.openness,0.0,1.0))
+        if self.glint is not None:
+            self.scr.blit(self.glint, self.glint_rect)
+        if self.lids is not None:
+            self.lids.paint(self.scr, cover)
+        elif cover > 0:
+            pygame.draw.rect(self.scr, EYELID_COL, (0,0,self.w,cover))
+            pygame.draw.rect(self.scr, EYELID_COL, (0,self.h-cover,self.w,cover))
+
+    def lid_rects(self, cover):
+        """De ooglid-rects voor een dekking uit layout() (texture-backend)."""
+        if self.lids is not None:
+            return self.lids.rects(cover)
+        if cover <= 0:
+            return []
+        return [(0, 0, self.w, cover), (0, self.h-cover, self.w, cover)]
+
+    def dirty_rects(self, cover):
+        """
+        Gebieden die sinds het vorige frame veranderd zijn: oude + nieuwe
+        pupilrect, oude + nieuwe irisrect en glimlicht als die met de parallax
+        verschoven zijn, en de strook waarover elk ooglid bewoog. None = alles.
+        """
+        if self._base_dirty or self._drawn_prect is None:
+            return None
+        rects = []
+        if self.iris_off != self._drawn_iris_off:
+            # buiten de irisschijf is de irislaag effen, dus alleen de schijf schuift
+            rects.append(self._iris_rect(self._drawn_iris_off).union(self._iris_rect(self.iris_off)))
+        if self.glint is not None and self.glint_rect.center != self._drawn_glint:
+            old = self.glint_rect.copy(); old.center = self._drawn_glint
+            rects.append(old.union(self.glint_rect))
+        old = self._drawn_prect
+        if old != self.prect:
+            if old.colliderect(self.prect):
+                rects.append(old.union(self.prect))
+            else:
+                rects += [old.copy(), self.prect.copy()]
+        c0 = self._drawn_cover
+        if c0 != cover and self.lids is not None:
+            for (a0, a1), (b0, b1) in zip(self.lids.bounds(c0), self.lids.bounds(cover)):
+                lo, hi = min(a0, b0), max(a1, b1)
+                if hi > lo:
+                    rects.append(pygame.Rect(0, lo, self.w, hi-lo))
+        elif c0 != cover:
+            lo, hi = min(c0, cover), max(c0, cover)
+            rects.append(pygame.Rect(0, lo, self.w, hi-lo))
+            rects.append(pygame.Rect(0, self.h-hi, self.w, hi-lo))
+        if len(rects) > 1:          # wat al binnen een ander rect valt (pupil in de iris) vervalt
+            rects = [r for i, r in enumerate(rects)
+                     if not any(j != i and q.contains(r) and (q != r or j < i) for j, q in enumerate(rects))]
+        return rects
+
+    def _iris_rect(self, off):
+        """Schermrect van de irisschijf (met rand) bij irislaag-offset `off`."""
+        W, H = self.base.get_size()
+        r = min(self.w, self.h)//2 - 20 + 2
+        return pygame.Rect(off[0] + W//2 - r, off[1] + H//2 - r, 2*r, 2*r).clip(self.scr.get_rect())
+
+    def layout(self):
+        """
+        Posities van de lagen voor dit frame (iris_off, prect, glint_rect), elk
+        met zijn parallaxfactor t.o.v. de kijkrichting; geeft de ooglid-dekking
+        terug (rijen per lid, of bij gebogen leden de openheid-stap).
+        """
+        x, y, p = self.draw_x, self.draw_y, self.iris_pad
+        k = CFG["PARALLAX_IRIS"]
+        self.iris_off = (int(x*k) - p, int(y*k) - p)
+        k = CFG["PARALLAX_PUPIL"]
+        self.prect.center=(int(self.cx + x*k), int(self.cy + y*k))
+        if self.glint is not None and CFG["PARALLAX_GLINT"]:
+            k = CFG["PARALLAX_GLINT"]
+            self.glint_rect.center = (int(self._glint_home[0] + x*k), int(self._glint_home[1] + y*k))
+        if self.lids is not None:
+            return self.lids.level(self.draw_open)
+        return max(0, eyelid_cover(self.h, clamp(self.draw_open,0.0,1.0)))
+
+    def draw(self, dirty=False):
+        """
+        Tekent het oog. Met dirty=True alleen de gewijzigde gebieden (zie
+        dirty_rects). Geeft de hertekende rects terug.
+        """
+        self.relatch()
+        cover = self.layout()
+        rects = self.dirty_rects(cover) if dirty else None
+        if rects is None:
+            rects = [self.scr.get_rect()]
+            self._paint(cover)
+        else:
+            clip = self.scr.get_clip()
+            for r in rects:
+                self.scr.set_clip(r)
+                self._paint(cover)
+            self.scr.set_clip(clip)
+        self._drawn_prect = self.prect.copy()
+        self._drawn_iris_off = self.iris_off
+        self._drawn_glint = self.glint_rect.center if self.glint is not None else None
+        self._drawn_cover = cover
+        self._base_dirty = False
+        return rects
+
+class BatchedEye(Eye):
+    """
+    Eye waarvan de smoothing-kanalen (kijk x/y, ooglid, pupil, iris, rot) een
+    rij in een DampBank hebben die alle ogen delen. De attributen blijven gewone
+    attributen; update_eyes() zet per simulatiestap waarden, snelheden, doelen
+    en parameters van alle ogen in de bank, doet één stap voor alle kanalen en
+    zet de uitkomst terug. Rekent bit-gelijk met Eye. Sneller dan scalar pas
+    vanaf ruim tien ogen: bij één of twee ogen wint de vaste NumPy-overhead
+    (zie eye_bench.py damp), daarom is scalar de standaard.
+    """
+    CHANNELS = 6
+
+    def __init__(self, *args, damp=None, **kw):
+        self.damp = damp if damp is not None else DampBank()
+        self._ch = len(self.damp)
+        for keep in (True, True, False, True, True, True):
+            self.damp.add(0.0, 0.0, keep_velocity=keep)
+        super().__init__(*args, **kw)
+
+    def step(self, dt):
+        if len(self.damp) == self.CHANNELS:
+            step_damp_group([self], dt)
+        else:                         # bank gedeeld, maar dit oog alleen: scalar
+            super().step(dt)
+
+def step_damp_group(eyes, dt):
+    """Eén smoothing-stap voor alle BatchedEye-ogen van één DampBank tegelijk."""
+    bank = eyes[0].damp
+    bank.value[:] = [v for e in eyes for v in
+                     (e.look_x, e.look_y, e.openness, e.scale, e.iris_strength, e.rot)]
+    bank.velocity[:] = [v for e in eyes for v in (e.vx, e.vy, 0.0, e.sv, e.iris_v, e.rot_v)]
+    bank.target[:] = [v for e in eyes for v in
+                      (e.tx, e.ty, e.open_target, e.scale_target, e.iris_strength_target, e.rot_target)]
+    lid, pupil, iris, rot = CFG["SMOOTH_LID"], CFG["SMOOTH_PUPIL"], CFG["SMOOTH_IRIS"], CFG["SMOOTH_ROT"]
+    bank.smooth[:] = [v for e in eyes for v in (e.smooth, e.smooth, lid, pupil, iris, rot)]
+    bank.max_speed[:] = [v for e in eyes for v in (e.maxspeed, e.maxspeed, 99, 10, 10, 360)]
+    for e in eyes:
+        e._look_prev = (e.look_x, e.vx, e.look_y, e.vy)
+        e._last_dt = dt
+    bank.step(dt)
+    vals = bank.value.tolist() if np is not None else bank.value
+    vels = bank.velocity.tolist() if np is not None else bank.velocity
+    for i, e in enumerate(eyes):
+        c = i * BatchedEye.CHANNELS
+        e.look_x, e.look_y, e.openness, e.scale, e.iris_strength, e.rot = vals[c:c+6]
+        e.vx, e.vy, _, e.sv, e.iris_v, e.rot_v = vels[c:c+6]
+
+def update_eyes(eyes, dt):
+    """
+    Alle ogen één frame verder. Delen ze één DampBank (--damp batch), dan per
+    simulatiestap één bankstap voor de kanalen van alle ogen; ze starten samen
+    met dezelfde sim_hz, dus ze doen hetzelfde aantal stappen.
+    """
+    damp = getattr(eyes[0], "damp", None)
+    if damp is None or len(damp) != BatchedEye.CHANNELS * len(eyes):
+        for eye in eyes:
+            eye.update(dt)
+        return
+    steps = [eye._sim_steps(dt) for eye in eyes]
+    n, sdt = steps[0]
+    for _ in range(n):
+        if eyes[0].sim_dt:
+            for eye in eyes:
+                eye._prev_state = eye._sim_state()
+        step_damp_group(eyes, sdt)
+        for eye in eyes:
+            eye._step_blink(sdt)
+    for eye in eyes:
+        eye._after_steps(dt if eye.sim_dt else sdt)
+
+# ---------- idle-leven ----------
+class IdleLife:
+    """
+    Lokaal 'leven' als de PLC stil is of steeds dezelfde pose stuurt:
+    micro-saccades, langzame drift en spontane knipperingen bovenop de
+    ontvangen doelen. Eén generator per proces, dus beide ogen bewegen samen.
+    Gebeurtenissen zijn een gezaaid Poisson-proces met vooraf getrokken
+    tijdstippen: per frame alleen wat vergelijkingen en een driftstap.
+    Wijkt de ontvangen pose merkbaar af van de pose waarop hij begon, dan
+    gaat hij direct uit (doelen = ontvangen); na LIFE_QUIET_S rust weer aan.
+    """
+    def __init__(self, seed=None):
+        self.rng = random.Random(CFG["LIFE_SEED"] if seed is None else seed)
+        self.active = False
+        self.anchor = None; self.quiet_since = None; self.t = None
+        self.sx = self.sy = 0.0      # saccade-offset, in eenheden LIFE_AMP x amplitude
+        self.dx = self.dy = 0.0      # drift-offset
+        self.drift_to = (0.0, 0.0)
+        self.next_saccade = self.next_blink = self.next_drift = float("inf")
+        self.saccades = self.blinks = self.cancels = 0
+
+    def _wait(self, hz):
+        rate = hz * CFG["LIFE_RATE"]
+        return self.rng.expovariate(rate) if rate > 0 else float("inf")
+
+    def _offset(self):
+        return (clamp(self.rng.gauss(0.0, 1.0), -2.0, 2.0), clamp(self.rng.gauss(0.0, 1.0), -2.0, 2.0))
+
+    def _pose(self, eyes):
+        """Ontvangen doelen, genormaliseerd (kijk in amplitudes, lid/pupil 0..1-achtig)."""
+        return [v for e in eyes for v in (e.in_tx / max(1e-6, e.ampx), e.in_ty / max(1e-6, e.ampy),
+                                          e.open_target, e.scale_target / e.max_scale)]
+
+    def update(self, now, eyes):
+        """Eén keer per frame, vóór eye.update(): zet tx/ty van alle ogen."""
+        dt = 0.0 if self.t is None else clamp(now - self.t, 0.0, 0.25)
+        self.t = now
+        pose = self._pose(eyes)
+        if self.anchor is None or max(abs(a - b) for a, b in zip(pose, self.anchor)) > CFG["LIFE_INPUT"]:
+            if self.active:
+                self.cancels += 1
+                for e in eyes:
+                    e.tx, e.ty = e.in_tx, e.in_ty
+            self.active = False
+            self.anchor = pose; self.quiet_since = now
+            self.sx = self.sy = self.dx = self.dy = 0.0
+            return
+        if not self.active:
+            if now - self.quiet_since < CFG["LIFE_QUIET_S"]:
+                return
+            self.active = True
+            self.drift_to = (0.0, 0.0)
+            self.next_saccade = now + self._wait(CFG["LIFE_SACCADE_HZ"])
+            self.next_blink = now + self._wait(CFG["LIFE_BLINK_HZ"])
+            self.next_drift = now
+        if now >= self.next_saccade:
+            self.sx, self.sy = self._offset()
+            self.saccades += 1
+            self.next_saccade = now + self._wait(CFG["LIFE_SACCADE_HZ"])
+        if now >= self.next_blink:
+            for e in eyes:
+                e.trigger_blink()
+            self.blinks += 1
+            self.next_blink = now + self._wait(CFG["LIFE_BLINK_HZ"])
+        if now >= self.next_drift:
+            self.drift_to = self._offset()
+            self.next_drift = now + self._wait(1.0 / max(0.05, CFG["LIFE_DRIFT_S"]))
+        # drift: met vaste snelheid richting het driftdoel
+        ex, ey = self.drift_to[0] - self.dx, self.drift_to[1] - self.dy
+        d = math.hypot(ex, ey); v = CFG["LIFE_DRIFT_SPEED"] * dt
+        if d <= v:
+            self.dx, self.dy = self.drift_to
+        else:
+            self.dx += ex / d * v; self.dy += ey / d * v
+        amp = CFG["LIFE_AMP"]
+        for e in eyes:
+            e.tx = e.in_tx + (self.sx + self.dx) * amp * e.ampx
+            e.ty = e.in_ty + (self.sy + self.dy) * amp * e.ampy
+
+    def stats(self):
+        return (f"leven {'aan' if self.active else 'uit'}: {self.saccades} saccades, "
+                f"{self.blinks} knipperingen, {self.cancels}x onderbroken door invoer")
+
+# ---------- presentatie ----------
+class AgeStats:
+    """Leeftijd van een pakket op het moment dat het eerst op het scherm komt (ms)."""
+    def __init__(self):
+        self.n = 0; self.total = 0.0; self.max = 0.0; self.latched = 0
+
+    def add(self, age_s):
+        ms = age_s * 1000.0
+        self.n += 1; self.total += ms
+        if ms > self.max: self.max = ms
+
+    def stats(self):
+        avg = self.total / max(1, self.n)
+        return f"pakketleeftijd bij present gem {avg:.1f} ms / max {self.max:.1f} ms (late-latch {self.latched}x)"
+
+class DisplayPresenter:
+    """
+    Presenteert het oog via pygame.display: mode "full" = hele frame + flip(),
+    "dirty" = alleen gewijzigde rects + display.update(rects). Houdt bij hoeveel
+    pixels er per frame naar het scherm gaan.
+    """
+    def __init__(self, mode="full"):
+        self.dirty = (mode == "dirty")
+        self.last_pixels = 0
+        self.pixels = self.frames = 0
+        self.draw_s = 0.0            # tekentijd van het laatste frame (zonder flip)
+        self.flip_s = 0.0            # tijd in flip()/update() van het laatste frame
+
+    def present(self, eye):
+        t0 = time.perf_counter()
+        rects = eye.draw(dirty=self.dirty)
+        t1 = time.perf_counter()
+        self.draw_s = t1 - t0
+        if self.dirty:
+            if rects: pygame.display.update(rects)
+        else:
+            pygame.display.flip()
+        self.flip_s = time.perf_counter() - t1
+        scr = eye.scr.get_rect()
+        self.last_pixels = sum(r.clip(scr).width * r.clip(scr).height for r in rects)
+        self.pixels += self.last_pixels
+        self.frames += 1
+        return self.last_pixels
+
+    def stats(self, full_pixels):
+        avg = self.pixels / max(1, self.frames)
+        return (f"present {'dirty' if self.dirty else 'full'}: gem {avg:.0f} px/frame "
+                f"({100.0*avg/max(1,full_pixels):.1f}% van volledig), {self.frames} frames")
+
+class ScaledPresenter(DisplayPresenter):
+    """
+    Rendert het oog in een offscreen surface op een interne resolutie
+    (CFG["RENDER_SCALE"] x scherm) en schaalt die één keer per frame naar het
+    scherm (smoothscale of scale). Verandert RENDER_SCALE (bv. door de
+    kwaliteitsregelaar), dan wordt het oog naar de nieuwe maat omgezet.
+    Altijd volledige frames: de opschaling raakt toch het hele scherm.
+    """
+    def __init__(self, screen, smooth=True):
+        super().__init__("full")
+        self.screen = screen
+        self.smooth = smooth
+        self.scale = None
+        self.off = None
+        self.target()
+
+    def target(self):
+        """Offscreen surface op de huidige RENDER_SCALE (nieuw als die wijzigde)."""
+        s = clamp(float(CFG["RENDER_SCALE"]), 0.1, 1.0)
+        if s != self.scale:
+            self.scale = s
+            W, H = self.screen.get_size()
+            self.off = pygame.Surface((max(16, int(W*s)), max(16, int(H*s)))).convert()
+        return self.off
+
+    def present(self, eye):
+        if clamp(float(CFG["RENDER_SCALE"]), 0.1, 1.0) != self.scale:
+            eye.resize(self.target())
+        t0 = time.perf_counter()
+        eye.draw()
+        if self.off.get_size() == self.screen.get_size():
+            self.screen.blit(self.off, (0,0))
+        elif self.smooth:
+            pygame.transform.smoothscale(self.off, self.screen.get_size(), self.screen)
+        else:
+            pygame.transform.scale(self.off, self.screen.get_size(), self.screen)
+        t1 = time.perf_counter()
+        self.draw_s = t1 - t0
+        pygame.display.flip()
+        self.flip_s = time.perf_counter() - t1
+        self.last_pixels = self.screen.get_width() * self.screen.get_height()
+        self.pixels += self.last_pixels
+        self.frames += 1
+        return self.last_pixels
+
+    def stats(self, full_pixels):
+        return super().stats(full_pixels) + f", intern {self.off.get_width()}x{self.off.get_height()}"
+
+class TexturePresenter:
+    """
+    Compositing via SDL2 Renderer/Texture (pygame._sdl2.video). De iris staat
+    als texture klaar; in palet-modus als een klein rijtje van STRENGTH_STEPS
+    textures op vaste irissterktes, elk één keer geüpload, en per frame worden
+    de twee buren overgevloeid (alpha-mod): een sterktewijziging kost geen
+    upload. Alleen een nieuwe base (kwaliteit, resolutie) leegt het rijtje.
+    De pupil komt uit de pupil-bank (zelfde gekwantiseerde maten en randdikte
+    als de surface-backend, rechtop), één texture per sprite in een LRU met
+    het geheugenbudget van de bank; de GPU draait hem. Oogleden zijn fill_rects. Eerst een accelerated
+    renderer, anders de software-renderer (ook headless met de dummy-driver).
+    """
+    STRENGTH_STEPS = 8         # irissterktes 0..1 met een eigen texture
+
+    def __init__(self, window, vsync=True):
+        from pygame._sdl2.video import Renderer, Texture, error as sdl_error
+        self.Texture = Texture
+        self.window = window
+        self.software = False
+        try:
+            self.renderer = Renderer(window, accelerated=1, vsync=vsync)
+        except sdl_error:
+            self.renderer = Renderer(window, accelerated=0, vsync=vsync)
+            self.software = True
+        self.iris = None; self._iris_src = None
+        self.iris_steps = {}           # stap -> texture (palet-modus)
+        self.pupils = OrderedDict()    # pupil-sleutel -> texture, LRU binnen het budget van de bank
+        self.pupil_bytes = 0
+        self.glint = None; self._glint_src = None
+        self.last_pixels = 0
+        self.pixels = self.frames = 0
+        self.draw_s = 0.0
+        self.flip_s = 0.0
+
+    def _upload_iris(self, eye):
+        t0 = time.perf_counter()
+        base = eye.base
+        if self.iris is not None and (self.iris.width, self.iris.height) == base.get_size():
+            self.iris.update(base)
+        else:
+            self.iris = self.Texture.from_surface(self.renderer, base)
+        self._iris_src = base
+        eye._base_dirty = False
+        record_rebuild("iris_texture", time.perf_counter() - t0)
+
+    def _iris_step(self, eye, i):
+        """Texture van de palet-iris op sterkte i/STRENGTH_STEPS (lazy, één keer per base)."""
+        tex = self.iris_steps.get(i)
+        if tex is None:
+            t0 = time.perf_counter()
+            idx = eye.base.copy()
+            idx.set_palette(iris_palette(i / float(self.STRENGTH_STEPS)))
+            # 8-bit index eerst naar 32-bit: sneller dan SDL de paletconversie laten doen
+            tex = self.iris_steps[i] = self.Texture.from_surface(self.renderer, idx.convert(32, 0))
+            record_rebuild("iris_texture", time.perf_counter() - t0)
+        return tex
+
+    def _draw_iris(self, eye):
+        if eye.iris_mode != "palette":
+            if self.iris is None or eye._base_dirty or eye.base is not self._iris_src:
+                self._upload_iris(eye)
+            self.iris.draw(dstrect=(eye.iris_off[0], eye.iris_off[1], self.iris.width, self.iris.height))
+            return
+        if eye.base is not self._iris_src:           # nieuwe indexsurface: rijtje opnieuw
+            self.iris_steps.clear()
+            self._iris_src = eye.base
+        eye._base_dirty = False
+        f = clamp(eye.draw_iris, 0.0, 1.0) * self.STRENGTH_STEPS
+        i = min(int(f), self.STRENGTH_STEPS - 1)
+        t = f - i
+        lo = self._iris_step(eye, i)
+        dst = (eye.iris_off[0], eye.iris_off[1], lo.width, lo.height)
+        lo.alpha = 255
+        lo.draw(dstrect=dst)
+        a = int(t * 255 + 0.5)
+        if a:
+            hi = self._iris_step(eye, i + 1)
+            hi.alpha = a
+            hi.draw(dstrect=dst)
+
+    def _pupil_texture(self, eye):
+        key = eye.pupils.key(eye.base_pw, eye.base_ph, eye.draw_scale, CFG["PUPIL_EDGE_W"])
+        tex = self.pupils.get(key)
+        if tex is not None:
+            self.pupils.move_to_end(key)
+            return tex
+        t0 = time.perf_counter()
+        tex = self.pupils[key] = self.Texture.from_surface(self.renderer, eye.pupils.get(key))  # alpha -> blend
+        self.pupil_bytes += tex.width * tex.height * 4
+        while self.pupil_bytes > eye.pupils.budget and len(self.pupils) > 1:
+            _, old = self.pupils.popitem(last=False)
+            self.pupil_bytes -= old.width * old.height * 4
+        record_rebuild("pupil_texture", time.perf_counter() - t0)
+        return tex
+
+    def present(self, eye):
+        t0 = time.perf_counter()
+        eye.relatch()
+        if eye.glint is not self._glint_src:
+            self._glint_src = eye.glint
+            self.glint = None if eye.glint is None else self.Texture.from_surface(self.renderer, eye.glint)
+        cover = eye.layout()
+        r = self.renderer
+        self._draw_iris(eye)
+        pupil = self._pupil_texture(eye)
+        dst = pygame.Rect(0, 0, pupil.width, pupil.height)
+        dst.center = eye.prect.center
+        pupil.draw(dstrect=dst, angle=-eye.draw_rot)   # SDL draait met de klok mee
+        if self.glint is not None:
+            self.glint.draw(dstrect=eye.glint_rect)
+        r.draw_color = (*EYELID_COL, 255)
+        for rect in eye.lid_rects(cover):
+            r.fill_rect(rect)
+        t1 = time.perf_counter()
+        self.draw_s = t1 - t0
+        r.present()
+        self.flip_s = time.perf_counter() - t1
+        self.last_pixels = eye.w * eye.h
+        self.pixels += self.last_pixels
+        self.frames += 1
+        return self.last_pixels
+
+    def stats(self, full_pixels):
+        return f"present texture ({'software' if self.software else 'accelerated'}), {self.frames} frames"
+
+class FramebufferPresenter:
+    """
+    Schrijft frames rechtstreeks in een gemmapt Linux-framebuffer (/dev/fbN),
+    zonder SDL-video. Pixelformaat uit FBIOGET_VSCREENINFO. Met ruimte voor
+    twee pagina's (yres_virtual >= 2*yres, zo nodig aangevraagd) tekent het oog
+    direct in de achterste pagina en wordt er geflipt met FBIOPAN_DISPLAY:
+    geen kopie. Anders één kopie per frame uit een offscreen surface in het
+    formaat van het device. Alleen met `mode` (w, h, bpp) mag een gewoon
+    bestand het device vervangen (tests; wordt zo nodig aangemaakt, twee
+    pagina's na elkaar); zonder `mode` is een pad dat geen framebuffer is
+    een fout.
+    """
+    FBIOGET_VSCREENINFO = 0x4600
+    FBIOPUT_VSCREENINFO = 0x4601
+    FBIOGET_FSCREENINFO = 0x4602
+    FBIOPAN_DISPLAY     = 0x4606
+    FBIO_WAITFORVSYNC   = 0x40044620
+    FIX = struct.Struct("@16sLIIIIHHHI")   # id, smem_start, smem_len, type, aux, visual, pan/wrap, line_length
+
+    def __init__(self, path, mode=None, vsync=True):
+        import fcntl
+        self.fcntl = fcntl
+        self.path = path
+        self.fd = os.open(path, os.O_RDWR | (os.O_CREAT if mode is not None else 0), 0o644)
+        self.var = bytearray(160)
+        try:
+            fcntl.ioctl(self.fd, self.FBIOGET_VSCREENINFO, self.var)
+            self.device = True
+        except OSError:
+            self.device = False
+            if mode is None:
+                os.close(self.fd)
+                raise OSError(f"{path} is geen framebuffer-device")
+        if self.device:
+            w, h, _, yv, _, _, bpp, _ = struct.unpack_from("8I", self.var)
+            bits = [struct.unpack_from("2I", self.var, 32 + 12*i) for i in range(4)]   # (offset, lengte) r,g,b,a
+            if yv < 2*h:
+                struct.pack_into("I", self.var, 12, 2*h)
+                try:
+                    fcntl.ioctl(self.fd, self.FBIOPUT_VSCREENINFO, self.var)
+                except OSError:
+                    pass
+                fcntl.ioctl(self.fd, self.FBIOGET_VSCREENINFO, self.var)
+                yv = struct.unpack_from("I", self.var, 12)[0]
+            fix = bytearray(128)
+            fcntl.ioctl(self.fd, self.FBIOGET_FSCREENINFO, fix)
+            stride = self.FIX.unpack_from(fix)[-1]
+            pages = 2 if yv >= 2*h else 1
+        else:
+            w, h, bpp = mode
+            bits = [(16,8), (8,8), (0,8), (24,8)] if bpp == 32 else [(11,5), (5,6), (0,5), (0,0)]
+            stride = w * bpp // 8
+            pages = 2
+            if os.fstat(self.fd).st_size < stride*h*pages:
+                os.ftruncate(self.fd, stride*h*pages)
+        self.w, self.h, self.bpp, self.stride, self.pages = w, h, bpp, stride, pages
+        if self.device and vsync:
+            try:
+                fcntl.ioctl(self.fd, self.FBIO_WAITFORVSYNC, struct.pack("I", 0))
+            except OSError:
+                vsync = False        # driver zonder vsync-ioctl
+        self.vsync = vsync and self.device
+        self.page_bytes = stride * h
+        self.mm = mmap.mmap(self.fd, self.page_bytes*pages, mmap.MAP_SHARED,
+                            mmap.PROT_READ | mmap.PROT_WRITE)
+        fmt = None
+        if bpp == 32 and stride == w*4:
+            fmt = {(16,8,0): "BGRA", (0,8,16): "RGBA"}.get(tuple(b[0] for b in bits[:3]))
+        self.direct = pages == 2 and fmt is not None
+        if self.direct:
+            # beide pagina's deelvlakken van één surface: RLE-sprites blijven gecodeerd bij het flippen
+            self.both = pygame.image.frombuffer(memoryview(self.mm), (w, 2*h), fmt)
+            self.pages_s = [self.both.subsurface((0, i*h, w, h)) for i in range(2)]
+            self.off = None
+        else:
+            masks = [((1 << n) - 1) << o if n else 0 for o, n in bits]
+            self.off = pygame.Surface((w, h), 0, bpp, masks)
+        how = "direct, 2 pagina's" if self.direct else f"kopie, {pages} pagina('s)"
+        self.desc = f"fb {path} {w}x{h}x{bpp} ({how})"
+        self.front = 0
+        self.last_pixels = 0
+        self.pixels = self.frames = 0
+        self.draw_s = 0.0
+        self.flip_s = 0.0
+
+    def target(self):
+        """Surface waarin het volgende frame getekend wordt."""
+        return self.pages_s[1 - self.front] if self.direct else self.off
+
+    def _copy(self, page):
+        # offscreen -> framebuffer; één slice als de regellengtes gelijk zijn
+        raw = self.off.get_buffer().raw
+        pitch = self.off.get_pitch()
+        base = page * self.page_bytes
+        if pitch == self.stride:
+            self.mm[base:base+self.page_bytes] = raw[:self.page_bytes]
+        else:
+            row = self.w * self.bpp // 8
+            for y in range(self.h):
+                o = base + y*self.stride
+                self.mm[o:o+row] = raw[y*pitch:y*pitch+row]
+
+    def _show(self, page):
+        if self.vsync:
+            self.fcntl.ioctl(self.fd, self.FBIO_WAITFORVSYNC, struct.pack("I", 0))
+        if self.device and self.pages == 2:
+            struct.pack_into("I", self.var, 20, page * self.h)    # yoffset
+            self.fcntl.ioctl(self.fd, self.FBIOPAN_DISPLAY, self.var)
+        self.front = page
+
+    def present(self, eye):
+        t0 = time.perf_counter()
+        eye.scr = self.target()
+        eye.draw()
+        back = 1 - self.front if self.pages == 2 else 0
+        if not self.direct:
+            self._copy(back)
+        t1 = time.perf_counter()
+        self.draw_s = t1 - t0
+        self._show(back)
+        self.flip_s = time.perf_counter() - t1
+        self.last_pixels = self.w * self.h
+        self.pixels += self.last_pixels
+        self.frames += 1
+        return self.last_pixels
+
+    def page(self, i=None):
+        """Kopie van een pagina (standaard de getoonde) als surface, voor tests."""
+        i = self.front if i is None else i
+        if self.direct:
+            return self.pages_s[i].copy()
+        surf = self.off.copy()
+        off = i * self.page_bytes
+        data = self.mm[off:off+self.page_bytes]
+        row = self.w * self.bpp // 8
+        buf = surf.get_buffer()
+        for y in range(self.h):
+            buf.write(data[y*self.stride:y*self.stride+row], y*surf.get_pitch())
+        del buf
+        return surf
+
+    def close(self):
+        self.pages_s = self.both = None
+        try:
+            self.mm.close()
+        except BufferError:
+            pass                     # surfaces nog in gebruik; gaat mee met het proces
+        os.close(self.fd)
+
+    def stats(self, full_pixels):
+        return f"present {self.desc}, {self.frames} frames"
+
+class PresenterGroup:
+    """
+    Eén presenter per oog (bij één oog gewoon die presenter): present(eyes)
+    laat elk oog door zijn eigen presenter zien; teken- en fliptijden opgeteld.
+    """
+    def __init__(self, presenters):
+        self.presenters = presenters
+        self.last_pixels = 0
+        self.draw_s = 0.0
+        self.flip_s = 0.0
+
+    def present(self, eyes):
+        self.draw_s = self.flip_s = 0.0
+        self.last_pixels = 0
+        for p, eye in zip(self.presenters, eyes):
+            self.last_pixels += p.present(eye)
+            self.draw_s += p.draw_s
+            self.flip_s += p.flip_s
+        return self.last_pixels
+
+    def scaled(self):
+        """Per oog de ScaledPresenter (of None), voor de kwaliteitsregelaar."""
+        return [p if isinstance(p, ScaledPresenter) else None for p in self.presenters]
+
+    def stats(self, full_pixels):
+        return "; ".join(p.stats(full_pixels) for p in self.presenters)
+
+class SpanPresenter(DisplayPresenter):
+    """
+    Meerdere ogen in één venster, elk oog in zijn eigen subsurface, daarna één
+    flip()/update() voor allemaal. Alleen voor --bench; op echte monitoren
+    krijgt elk oog een eigen venster via --backend texture.
+    """
+    def present(self, eyes):
+        t0 = time.perf_counter()
+        self.n = len(eyes)
+        rects = []
+        for eye in eyes:
+            ox, oy = eye.scr.get_abs_offset()
+            rects += [r.move(ox, oy) for r in eye.draw(dirty=self.dirty)]
+        t1 = time.perf_counter()
+        self.draw_s = t1 - t0
+        if self.dirty:
+            if rects: pygame.display.update(rects)
+        else:
+            pygame.display.flip()
+        self.flip_s = time.perf_counter() - t1
+        self.last_pixels = sum(r.width * r.height for r in rects)
+        self.pixels += self.last_pixels
+        self.frames += 1
+        return self.last_pixels
+
+    def stats(self, full_pixels):
+        return super().stats(full_pixels * getattr(self, "n", 1))
+
+# ---------- kwaliteitsregelaar ----------
+# Niveau 0 = CFG zoals opgestart; elk volgend niveau overschrijft deze knoppen.
+# RENDER_SCALE telt alleen mee met --render-scale auto.
+QUALITY_LEVELS = [
+    {},
+    {"IRIS_STEPS": 48, "PUPIL_VERTEX_PX": 4.0, "PUPIL_AA": True,  "PUPIL_QUANT": 3, "IRIS_REBUILD_EPS": 0.03,
+     "RENDER_SCALE": 1.0},
+    {"IRIS_STEPS": 32, "PUPIL_VERTEX_PX": 6.0, "PUPIL_AA": False, "PUPIL_QUANT": 4, "IRIS_REBUILD_EPS": 0.05,
+     "RENDER_SCALE": 0.75},
+    {"IRIS_STEPS": 16, "PUPIL_VERTEX_PX": 9.0, "PUPIL_AA": False, "PUPIL_QUANT": 6, "IRIS_REBUILD_EPS": 0.08,
+     "RENDER_SCALE": 0.5},
+]
+
+class QualityGovernor:
+    """
+    Bewaakt de werktijd per frame (zonder wachten op vsync) en schakelt een
+    kwaliteitsniveau omlaag zodra p90 van de laatste `window` frames boven het
+    budget komt, en pas weer omhoog als p95 gedurende `up_hold` s onder
+    budget*up_frac blijft. Na elke wissel `cooldown` s niets doen (hysterese).
+    `scaled`: per oog de ScaledPresenter (of None); een nieuwe RENDER_SCALE
+    wordt dan al bij de wissel toegepast, zodat de pupil-bank op de nieuwe
+    maat voorbouwt en niet pas bij de volgende present().
+    Een stap naar een lagere RENDER_SCALE is een proef: is p90 na een vol
+    venster niet lager dan ervoor (het opschalen kost meer dan het kleinere
+    tekenen oplevert), dan gaat de schaal op dit en de lagere niveaus terug.
+    """
+    KNOBS = ("IRIS_STEPS", "PUPIL_VERTEX_PX", "PUPIL_AA", "PUPIL_QUANT", "IRIS_REBUILD_EPS", "RENDER_SCALE")
+
+    def __init__(self, eyes, budget_ms, levels=QUALITY_LEVELS, window=30,
+                 up_frac=0.5, up_hold=5.0, cooldown=2.0, log=print, scale_levels=False, scaled=None):
+        self.eyes = eyes
+        self.scaled = list(scaled) if scaled else [None] * len(eyes)
+        self.budget = budget_ms / 1000.0
+        self.levels = [dict({k: CFG[k] for k in self.KNOBS}, **lv) for lv in levels]
+        if not scale_levels:
+            for lv in self.levels: lv["RENDER_SCALE"] = CFG["RENDER_SCALE"]
+        self.levels[0]["PUPIL_QUANT"] = eyes[0].pupils.quant
+        self.level = 0
+        self.window = window; self.up_frac = up_frac; self.up_hold = up_hold; self.cooldown = cooldown
+        self.log = log
+        self.recent = deque(maxlen=window)
+        self._changed_at = float("-inf")
+        self._good_since = None
+        self._probe = None           # (p90 vóór de schaalstap, schaal ervoor)
+        self.changes = 0
+
+    def _pct(self, p):
+        xs = sorted(self.recent)
+        return xs[min(len(xs)-1, int(p/100.0*len(xs)))]
+
+    def add(self, work_s, now):
+        """Frametijd doorgeven; geeft het nieuwe niveau terug bij een wissel, anders None."""
+        self.recent.append(work_s)
+        if len(self.recent) < self.window or now - self._changed_at < self.cooldown:
+            return None
+        p90 = self._pct(90)
+        if self._probe is not None:
+            before, scale = self._probe
+            self._probe = None
+            if p90 >= before:
+                for lv in self.levels[self.level:]:
+                    lv["RENDER_SCALE"] = max(lv["RENDER_SCALE"], scale)
+                return self.set_level(self.level, now, f"lagere RENDER_SCALE niet sneller "
+                                      f"(p90 {p90*1000:.1f} >= {before*1000:.1f} ms), terug naar {scale}")
+        if p90 > self.budget and self.level < len(self.levels)-1:
+            return self.set_level(self.level+1, now, f"p90 {p90*1000:.1f} ms > budget {self.budget*1000:.1f} ms")
+        if self._pct(95) < self.budget*self.up_frac and self.level > 0:
+            if self._good_since is None:
+                self._good_since = now
+            elif now - self._good_since >= self.up_hold:
+                return self.set_level(self.level-1, now, f"p95 {self._pct(95)*1000:.1f} ms, ruim binnen budget")
+        else:
+            self._good_since = None
+        return None
+
+    def set_level(self, level, now, reason=""):
+        old, self.level = self.level, level
+        scale = CFG["RENDER_SCALE"]
+        if self.levels[level]["RENDER_SCALE"] < scale and self.recent:
+            self._probe = (self._pct(90), scale)
+        for k, v in self.levels[level].items():
+            CFG[k] = v
+        for eye, sp in zip(self.eyes, self.scaled):
+            if sp is not None and sp.target() is not eye.scr:
+                eye.resize(sp.off)
+            eye.pupils.quant = self.levels[level]["PUPIL_QUANT"]
+            eye.apply_quality()
+        self.recent.clear()
+        self._changed_at = now; self._good_since = None
+        self.changes += 1
+        self.log(f"kwaliteit {old} -> {level} ({reason}): " +
+                 ", ".join(f"{k}={v}" for k,v in self.levels[level].items()))
+        return level
+
+# ---------- frametiming per fase ----------
+PHASES = ("events", "udp", "update", "rebuild", "draw", "flip", "frame")
+
+class PhaseStats:
+    """
+    Rollende histogrammen van de tijd per fase van de hoofdlus. Buckets op
+    log-schaal (4 per verdubbeling, 20 µs .. ~1.3 s), dus add() is één bisect
+    en een optelling. Elke `window` s schuift het venster door; summary()
+    kijkt naar het huidige + vorige venster.
+    """
+    EDGES = [0.02 * 2**(i/4.0) for i in range(64)]     # ms
+
+    def __init__(self, window=60.0):
+        self.window = window
+        self._t0 = time.perf_counter()
+        self.cur = self._empty(); self.prev = self._empty()
+
+    def _empty(self):
+        return {p: [[0]*(len(self.EDGES)+1), 0, 0.0, 0.0] for p in PHASES}   # hist, n, som, max
+
+    def add(self, phase, seconds):
+        ms = seconds * 1000.0
+        h = self.cur[phase]
+        h[0][bisect.bisect_left(self.EDGES, ms)] += 1
+        h[1] += 1; h[2] += ms
+        if ms > h[3]: h[3] = ms
+
+    def roll(self, now):
+        if now - self._t0 >= self.window:
+            self._t0 = now
+            self.prev, self.cur = self.cur, self._empty()
+
+    def _merged(self, phase):
+        a, b = self.cur[phase], self.prev[phase]
+        return [x+y for x,y in zip(a[0], b[0])], a[1]+b[1], a[2]+b[2], max(a[3], b[3])
+
+    def _pct(self, hist, n, p):
+        k = p/100.0 * n; acc = 0
+        for i, c in enumerate(hist):
+            acc += c
+            if acc >= k and c:
+                return self.EDGES[min(i, len(self.EDGES)-1)]   # bovengrens bucket
+        return 0.0
+
+    def summary(self):
+        out = {}
+        for p in PHASES:
+            hist, n, tot, mx = self._merged(p)
+            out[p] = {"n": n, "mean_ms": round(tot/n, 3) if n else 0.0,
+                      "p50_ms": round(self._pct(hist, n, 50), 3), "p95_ms": round(self._pct(hist, n, 95), 3),
+                      "p99_ms": round(self._pct(hist, n, 99), 3), "max_ms": round(mx, 3)}
+        return out
+
+    def line(self):
+        sm = self.summary()
+        parts = " ".join(f"{p} {sm[p]['p95_ms']:.2f}" for p in PHASES if p != "frame")
+        f = sm["frame"]
+        return (f"fase p95 ms: {parts} | frame p50 {f['p50_ms']:.2f} p99 {f['p99_ms']:.2f} "
+                f"max {f['max_ms']:.2f} ({f['n']} frames)")
+
+class StatsServer:
+    """
+    Lokale UDP-statspoort: elk datagram krijgt als antwoord een JSON-object
+    met de fase-histogrammen en tellers. Opvragen bv. met:
+      echo | nc -u -w1 127.0.0.1 5105
+    """
+    def __init__(self, port, collect):
+        self.collect = collect
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", port))
+        self.sock.setblocking(False)
+
+    def poll(self):
+        try:
+            while True:
+                _, addr = self.sock.recvfrom(64)
+                self.sock.sendto(json.dumps(self.collect()).encode()[:65000], addr)
+        except (BlockingIOError, ConnectionError):
+            pass
+
+    def close(self):
+        self.sock.close()
+
+# ---------- benchmark (headless) ----------
+def synthetic_script(t):
+    """
+    Synthetisch PLC-script (14 bytes) op tijd t: kijkrondjes, saccades,
+    een lokale knipper elke 3 s (teller), pupil-sweep, iris-golf en pupilkanteling.
+    """
+    x = 128 + 110*math.sin(t*1.3) + (40 if int(t*2) % 5 == 0 else 0)
+    y = 128 + 90*math.sin(t*0.9 + 1.0)
+    lid = 0
+    pupil = 128 + 127*math.sin(t*0.7)
+    iris = 128 + 127*math.sin(t*0.25)
+    rot = 128 + 60*math.sin(t*0.3)
+    ev = int((t + 0.2) / 3.0) & 0xFF
+    v = [int(clamp(c, 0, 255)) for c in (x, y, lid, pupil)]
+    return tuple(v + v + [int(clamp(iris, 0, 255))]*2 + [int(clamp(rot, 0, 255))]*2 + [ev]*2)
+
+def load_recording(path):
+    """CSV zoals --record schrijft: per regel t,b0,b1,... (t in s vanaf start)."""
+    rec = []
+    with open(path) as f:
+        for line in f:
+            parts = line.strip().split(",")
+            if len(parts) >= 9 and not line.startswith("#"):
+                rec.append((float(parts[0]), tuple(int(v) for v in parts[1:])))
+    t0 = rec[0][0] if rec else 0.0
+    return [(t - t0, v) for t,v in rec]
+
+def run_bench(args, eyes, presenter):
+    """Render args.bench frames zonder vsync en rapporteer frametijden en rebuilds."""
+    rec = load_recording(args.bench_script) if args.bench_script else None
+    if rec is not None and not rec:
+        print(f"[bench] geen pakketten in {args.bench_script}"); return
+    step = 1.0 / args.bench_fps
+    times = []
+    governor = None
+    if args.governor:
+        governor = QualityGovernor(eyes, args.frame_budget_ms, log=lambda m: print(f"[bench] {m}"),
+                                   scale_levels=args.render_scale == "auto",
+                                   scaled=getattr(presenter, "scaled", lambda: None)())
+    j = 0; vals = None; t_prev = -1.0
+    life = IdleLife(args.life_seed) if args.life else None
+    REBUILDS.clear()
+    t_wall = time.perf_counter()
+    for i in range(args.bench):
+        t = i * step
+        if rec is None:
+            vals = synthetic_script(t)
+        else:
+            t = t % (rec[-1][0] + step)           # opname herhalen
+            if t < t_prev: j = 0
+            t_prev = t
+            while j < len(rec) and rec[j][0] <= t:
+                vals = rec[j][1]; j += 1
+        if vals is not None:
+            for eye in eyes:
+                eye.set_targets_from_bytes(*eye_fields(vals, eye.side))
+        t0 = time.perf_counter()
+        if life is not None:
+            life.update(i * step, eyes)
+        update_eyes(eyes, step)
+        presenter.present(eyes)
+        times.append(time.perf_counter() - t0)
+        if governor is not None:
+            governor.add(times[-1] - presenter.flip_s, t)    # werktijd zonder flip, zoals in de lus
+        if pygame.display.get_init(): pygame.event.pump()
+    wall = time.perf_counter() - t_wall
+
+    times.sort()
+    pct = lambda p: times[min(len(times)-1, int(p/100.0*len(times)))] * 1000.0
+    src = args.bench_script or "synthetisch"
+    print(f"[bench] {len(times)} frames {args.width}x{args.height} oog={args.eye} script={src} "
+          f"backend={args.backend} present={args.present} iris={CFG['IRIS_MODE']} sim_hz={args.sim_hz:g}")
+    print(f"[bench] frametijd p50 {pct(50):.2f} ms  p95 {pct(95):.2f} ms  p99 {pct(99):.2f} ms  "
+          f"max {times[-1]*1000:.2f} ms  => {len(times)/max(1e-9, sum(times)):.0f} fps "
+          f"({len(times)/max(1e-9, wall):.0f} fps incl. overhead)")
+    print(f"[bench] rebuilds: {rebuild_stats()}")
+    if life is not None:
+        print(f"[bench] {life.stats()}")
+    if governor is not None:
+        print(f"[bench] kwaliteitsniveau {governor.level}, {governor.changes} wissels")
+    print(f"[bench] {eyes[0].pupils.stats()}; {presenter.stats(args.width*args.height)}")
 
 # ---------- main ----------
 def main():
     ap = argparse.ArgumentParser(description="PLC UDP -> één oog per proces (radiale iris + pupilrand + iris-intensiteit)")
-    ap.add_argument("--eye", choices=["left","right"], required=True)
+    ap.add_argument("--eye", choices=["left","right"])
+    ap.add_argument("--eyes", metavar="left,right",
+                    help="meerdere ogen in één proces (één UDP-socket, gedeelde asset-cache), elk op een eigen "
+                         "monitor; vraagt --backend texture of fb")
     ap.add_argument("--monitor", type=int, default=0)
+    ap.add_argument("--monitors", metavar="0,1", help="monitor per oog bij --eyes (standaard --monitor, +1, ...)")
     ap.add_argument("--port", type=int, default=5005)
     ap.add_argument("--width", type=int, default=1080)
     ap.add_argument("--height", type=int, default=1080)
     ap.add_argument("--novsync", action="store_true")
     ap.add_argument("--borderless", action="store_true")
     ap.add_argument("--fullscreen", action="store_true")
+    ap.add_argument("--cache-dir", default=default_cache_dir(),
+                    help="map voor gerenderde assets (iris/pupil) tussen herstarts")
+    ap.add_argument("--no-cache", action="store_true", help="geen asset-cache op schijf")
+    ap.add_argument("--pupil-budget-mb", type=float, default=CFG["PUPIL_BANK_MB"],
+                    help="geheugenbudget voor voorgetekende pupil-sprites")
+    ap.add_argument("--pupil-quant", type=int, default=CFG["PUPIL_QUANT"],
+                    help="pupilmaat-stap in px (halve hoogte)")
+    ap.add_argument("--present", choices=["full","dirty"], default="full",
+                    help="dirty = alleen gewijzigde gebieden hertekenen en pushen")
+    ap.add_argument("--rx", choices=["thread","inline"], default="thread",
+                    help="thread = aparte UDP-ontvangstthread, inline = socket lezen tussen frames")
+    ap.add_argument("--late-latch", action="store_true",
+                    help="nieuwste pakket vlak voor de pupil-blit nog toepassen (minder latency)")
+    ap.add_argument("--jitter-ms", type=float, default=0.0,
+                    help="jitterbuffer: doelen met deze vertraging interpoleren (bv. 30); 0 = uit")
+    ap.add_argument("--seq-header", action="store_true",
+                    help="pakketten hebben een volgnummer-header (KOSQ, plc_to_udp_bridge.py SEQ_HEADER / "
+                         "eyes_send.py --seq); de jitterbuffer ordent dan op zendtijd")
+    ap.add_argument("--sim-hz", type=float, default=CFG["SIM_HZ"],
+                    help="vaste simulatiefrequentie (bv. 120); 0 = stap met de frametijd")
+    ap.add_argument("--damp", choices=["scalar","batch"], default="scalar",
+                    help="batch = smoothing-kanalen van alle ogen in één DampBank, één NumPy-stap per frame "
+                         "(pas sneller bij veel kanalen), scalar = per kanaal")
+    ap.add_argument("--expressions", metavar="JSON",
+                    help="expressie-presets laden (naam -> {lid, pupil, iris, rot, x, y}); byte 1 = eerste")
+    ap.add_argument("--life", action="store_true",
+                    help="idle-leven: micro-saccades, drift en knipperen zolang de ontvangen pose stilstaat")
+    ap.add_argument("--life-rate", type=float, default=CFG["LIFE_RATE"], help="schaal op de frequenties (--life)")
+    ap.add_argument("--life-amp", type=float, default=CFG["LIFE_AMP"], help="uitslag, fractie van de kijkamplitude (--life)")
+    ap.add_argument("--life-seed", type=int, default=CFG["LIFE_SEED"], help="seed voor --life (standaard willekeurig)")
+    ap.add_argument("--no-idle", action="store_true",
+                    help="altijd renderen, ook als het oog stilstaat")
+    ap.add_argument("--report-every", type=float, default=60.0,
+                    help="samenvatting (render/idle, present, fasetijden) elke N s in de log; 0 = uit")
+    ap.add_argument("--stats-port", type=int, default=0,
+                    help="lokale UDP-poort (127.0.0.1) die fasetijden als JSON teruggeeft; 0 = uit")
+    ap.add_argument("--bench", type=int, default=0, metavar="N",
+                    help="headless benchmark: N frames renderen (dummy video-driver, geen vsync/UDP)")
+    ap.add_argument("--bench-script", metavar="CSV",
+                    help="opname (zie --record) i.p.v. synthetisch script voor --bench")
+    ap.add_argument("--bench-fps", type=float, default=60.0, help="gesimuleerde framerate voor --bench")
+    ap.add_argument("--record", metavar="CSV", help="ontvangen pakketten opnemen (t,b0,b1,...)")
+    ap.add_argument("--governor", action="store_true",
+                    help="kwaliteit automatisch omlaag/omhoog op basis van frametijd")
+    ap.add_argument("--frame-budget-ms", type=float, default=14.0,
+                    help="werktijd per frame (zonder vsync-wachten) voor --governor")
+    ap.add_argument("--render-scale", default="1",
+                    help="interne renderresolutie t.o.v. scherm (bv. 0.5), of 'auto' via --governor")
+    ap.add_argument("--render-filter", choices=["smooth","nearest"], default=None,
+                    help="opschalen met smoothscale of scale; standaard smooth, bij --render-scale auto "
+                         "nearest (smoothscale kost meer dan de lagere schaal bespaart)")
+    ap.add_argument("--backend", choices=["surface","texture","fb"], default="surface",
+                    help="texture = compositing via SDL2 Renderer/Texture (accelerated, anders software), "
+                         "fb = rechtstreeks in het Linux-framebuffer (zonder SDL-video)")
+    ap.add_argument("--fb-device", default="/dev/fb0",
+                    help="framebuffer-device voor --backend fb (of een gewoon bestand met --fb-mode, bv. voor tests)")
+    ap.add_argument("--fb-mode", default=None, metavar="WxH[xBPP]",
+                    help="formaat als --fb-device een gewoon bestand is (bpp standaard 32); "
+                         "zonder deze optie moet --fb-device een echt framebuffer zijn")
+    ap.add_argument("--iris", choices=["palette","circles"], default=CFG["IRIS_MODE"],
+                    help="palette = iris via 8-bit palet (geen rebuild), circles = oude cirkel-lus")
     args = ap.parse_args()
+    if bool(args.eye) == bool(args.eyes):
+        ap.error("geef --eye of --eyes")
+    if args.eyes:
+        if any(e not in ("left","right") for e in args.eyes.split(",")):
+            ap.error("--eyes: alleen left/right, bv. --eyes left,right")
+        if args.backend == "fb" and len(args.fb_device.split(",")) != len(args.eyes.split(",")):
+            ap.error("--backend fb met --eyes: één --fb-device per oog, bv. /dev/fb0,/dev/fb1")
+        if args.backend == "surface" and "," in args.eyes and not args.bench:
+            # één display-surface = één venster; over meerdere monitoren spannen lukt alleen
+            # onder X11 (niet kmsdrm) en negeert de monitor van het tweede oog
+            ap.error("--eyes met meerdere ogen: gebruik --backend texture (één venster per monitor, "
+                     "ook onder kmsdrm) of --backend fb; de surface-backend opent maar één venster")
+        args.eye = args.eyes.replace(",", "+")    # naam in de log
+    CFG["IRIS_MODE"] = args.iris
+
+    t_start = time.perf_counter()
+    if args.bench:
+        args.novsync = True
+        args.borderless = True; args.fullscreen = False   # dummy-driver: venster op exacte maat
+    if args.backend != "fb":
+        choose_driver(headless=bool(args.bench))
+    if args.backend in ("texture","fb") and (args.present == "dirty" or args.render_scale != "1"):
+        print(f"[{args.eye}] {args.backend}-backend: --present/--render-scale genegeerd")
+        args.present = "full"; args.render_scale = "1"
+    sides = args.eyes.split(",") if args.eyes else [args.eye]
+    monitors = ([int(m) for m in args.monitors.split(",")] if args.monitors
+                else [args.monitor + i for i in range(len(sides))])
+    fb_devices = args.fb_device.split(",")
+    multi = len(sides) > 1
+    if multi and args.render_scale != "1":
+        print(f"[{args.eye}] --render-scale genegeerd bij meerdere ogen")
+        args.render_scale = "1"
+    if args.backend == "fb":
+        mode = tuple(([int(v) for v in args.fb_mode.split("x")] + [32])[:3]) if args.fb_mode else None
+        # net als bij de texture-backend wacht alleen het laatste device op vsync: één wacht per frame
+        try:
+            outs = [FramebufferPresenter(dev, mode=mode, vsync=not args.novsync and i == len(fb_devices)-1)
+                    for i, dev in enumerate(fb_devices)]
+        except OSError as e:
+            ap.error(f"--fb-device: {e}; een gewoon bestand alleen met --fb-mode WxH[xBPP]")
+        args.width, args.height = outs[0].w, outs[0].h
+        if not outs[-1].vsync: args.novsync = True    # geen vsync-ioctl: zelf op 60 fps begrenzen
+        screens = [fb.target() for fb in outs]
+    elif args.backend == "texture":
+        windows = [open_texture_window(mon, args.width, args.height,
+                                       fullscreen=(not args.borderless) or args.fullscreen,
+                                       title=f"Kattenoog {side} (monitor {mon})")
+                   for side, mon in zip(sides, monitors)]
+        # alleen maat; tekenen gaat via de renderer
+        screens = [pygame.Surface((args.width, args.height)) for _ in sides]
+    else:
+        # meerdere ogen (alleen --bench): één offscreen-venster, elk oog een deelvlak
+        scr = open_window_on_monitor(monitors[0], args.width*len(sides), args.height,
+                                     vsync=not args.novsync,
+                                     fullscreen=((not args.borderless) or args.fullscreen) and not multi)
+        pygame.display.set_caption(f"Kattenoog {args.eye} (monitor {args.monitor})")
+        screens = [scr.subsurface((i*args.width, 0, args.width, args.height)) if multi else scr
+                   for i in range(len(sides))]
 
-    choose_driver()
-    scr = open_window_on_monitor(args.monitor, args.width, args.height,
-                                 vsync=not args.novsync,
-                                 fullscreen=(not args.borderless) or args.fullscreen)
-    pygame.display.set_caption(f"Kattenoog {args.eye} (monitor {args.monitor})")
+    # eén cache en één pupil-bank voor alle ogen (zelfde CFG en maat = zelfde sleutels)
+    cache = None if args.no_cache else AssetCache(args.cache_dir)
+    pupils = PupilBank(args.pupil_budget_mb, args.pupil_quant, cache=cache)
+    auto_scale = args.render_scale == "auto"
+    CFG["RENDER_SCALE"] = 1.0 if auto_scale else float(args.render_scale)
+    CFG["LIFE_RATE"], CFG["LIFE_AMP"] = args.life_rate, args.life_amp
+    if args.expressions:
+        load_expressions(args.expressions)
+    print(f"[{args.eye}] expressies: " + ", ".join(f"{i} {name}" for i, (name, _) in enumerate(EXPRESSIONS, 1)))
+    if auto_scale and not args.governor:
+        print(f"[{args.eye}] --render-scale auto werkt via --governor; nu vast op 1.0")
+    if args.backend == "fb":
+        presenter = PresenterGroup(outs)
+        for fb in outs: print(f"[{args.eye}] output {fb.desc}")
+    elif args.backend == "texture":
+        presenter = PresenterGroup([TexturePresenter(w, vsync=not args.novsync and i == len(windows)-1)
+                                    for i, w in enumerate(windows)])
+        sw = presenter.presenters[0].software
+        print(f"[{args.eye}] texture-backend ({'software' if sw else 'accelerated'})")
+    elif multi:
+        presenter = SpanPresenter(args.present)
+    elif auto_scale or CFG["RENDER_SCALE"] != 1.0:
+        filt = args.render_filter or ("nearest" if auto_scale else "smooth")
+        presenter = PresenterGroup([ScaledPresenter(scr, smooth=(filt == "smooth"))])
+        screens = [presenter.presenters[0].target()]
+    else:
+        presenter = PresenterGroup([DisplayPresenter(args.present)])
+    eyes = []
+    damp = DampBank() if args.damp == "batch" else None
+    for side, target in zip(sides, screens):
+        r = target.get_width() / float(args.width)
+        kw = {"damp": damp} if damp is not None else {}
+        eye = (BatchedEye if damp is not None else Eye)(
+            target, target.get_width(), target.get_height(), ampx=240*r, ampy=140*r,
+            cache=cache, pupils=pupils, sim_hz=args.sim_hz, **kw)
+        eye.side = side
+        eye.pupil_from_bank = args.backend != "texture"
+        eyes.append(eye)
+    # RLE-pupils alleen als alle ogen op één vlak tekenen: elk ander doelvlak codeert de sprite opnieuw
+    if args.backend != "texture" and len({t.get_abs_parent() for t in screens}) == 1:
+        pupils.rle_target = screens[0].get_abs_parent()
+    t0 = time.perf_counter()
+    n = eyes[0].prebuild_pupils()
+    print(f"[{args.eye}] {n} pupil-sprites voorgetekend in {(time.perf_counter()-t0)*1000:.0f} ms; {pupils.stats()}")
 
-    eye = Eye(scr, args.width, args.height)
+    if args.bench:
+        run_bench(args, eyes, presenter)
+        pygame.quit()
+        return
 
-    # UDP listener: accepteert 8 of 10 bytes
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-    sock.bind(("0.0.0.0", args.port))
-    sock.setblocking(False)
-    print(f"[{args.eye}] UDP :{args.port} verwacht 8 of 10 bytes:")
+    # UDP listener: accepteert 8, 10, 12, 14 of 18 bytes; één socket voor alle ogen
+    rx = UdpReceiver(args.port, seq_header=args.seq_header)
+    jitter = None
+    if args.jitter_ms > 0:
+        jitter = JitterBuffer(args.jitter_ms / 1000.0)
+        rx.keep_all()
+        if args.late_latch:
+            print(f"[{args.eye}] --late-latch genegeerd: jitterbuffer vertraagt bewust")
+            args.late_latch = False
+    if args.rx == "thread":
+        rx.start()
+    print(f"[{args.eye}] UDP :{args.port} ({args.rx}) verwacht 8, 10, 12, 14 of 18 bytes:")
     print("   8  = Lx,Ly,Lblink,Lpupil, Rx,Ry,Rblink,Rpupil")
     print("   10 = bovenstaande + Liris,Riris (0..255)")
+    print("   12 = bovenstaande + Lrot,Rrot (pupilkanteling, 128 = recht)")
+    print("   14 = bovenstaande + Lev,Rev (knipperteller: elke verandering = één lokale knipper)")
+    print("   18 = bovenstaande + Lexpr,Rexpr,Lblend,Rblend "
+          f"(expressie-preset, overvloeitijd x {CFG['EXPR_BLEND_STEP']*1000:g} ms)")
 
     # defaults
-    eye.set_targets_from_bytes(128,128,0,128)
+    for eye in eyes:
+        eye.set_targets_from_bytes(128,128,0,128)
+
+    record = open(args.record, "w") if args.record else None
+    def record_packet(pkt):
+        if record is not None:
+            record.write(f"{pkt.t - t_start:.4f}," + ",".join(str(v) for v in pkt.vals) + "\n")
+
+    def apply_vals(vals):
+        for eye in eyes:
+            eye.set_targets_from_bytes(*eye_fields(vals, eye.side))
+
+    def apply_packet(pkt):
+        record_packet(pkt)
+        apply_vals(pkt.vals)
+        for eye in eyes:
+            eye.packet_t = pkt.t
+
+    life = IdleLife(args.life_seed) if args.life else None
+    ages = AgeStats()
+    if args.late_latch:
+        # een pakket dat tijdens het tekenen van het ene oog binnenkomt, geldt
+        # ook voor de ogen daarna: elk oog doet zijn kijkstap over als het
+        # latch-pakket nieuwer is dan wat het al zag
+        latched = [0]
+        def make_latch():
+            seen = [0]
+            def latch():
+                pkt = rx.take()
+                if pkt is not None:
+                    apply_packet(pkt)
+                    ages.latched += 1
+                    latched[0] += 1
+                if seen[0] == latched[0]: return False
+                seen[0] = latched[0]
+                return True
+            return latch
+        for eye in eyes:
+            eye.late_latch = make_latch()
 
     clock = pygame.time.Clock()
     prev = time.perf_counter()
+    first_frame = True
+    governor = None
+    if args.governor:
+        governor = QualityGovernor(eyes, args.frame_budget_ms,
+                                   log=lambda m: print(f"[{args.eye}] {m}"), scale_levels=auto_scale,
+                                   scaled=getattr(presenter, "scaled", lambda: None)())
+    phases = PhaseStats(window=args.report_every if args.report_every > 0 else 60.0)
+    stats_srv = None
+    if args.stats_port:
+        def collect():
+            return {"eye": args.eye, "phases": phases.summary(),
+                    "render_s": round(t_render, 2), "idle_s": round(t_idle, 2),
+                    "udp": rx.stats(), "present": presenter.stats(args.width*args.height),
+                    "pupils": pupils.stats(), "latency": ages.stats(),
+                    "jitter": jitter.stats() if jitter else None, "rebuilds": rebuild_stats(),
+                    "life": life.stats() if life else None}
+        try:
+            stats_srv = StatsServer(args.stats_port, collect)
+            print(f"[{args.eye}] stats op udp 127.0.0.1:{args.stats_port}")
+        except OSError as e:
+            print(f"[{args.eye}] stats-poort {args.stats_port} niet beschikbaar: {e}")
+    last_report = prev
+    t_render = t_idle = 0.0
+    idle = False
+    # late-latch pacing: frameperiode (gemeten tussen flips) en rendertijd (update+draw)
+    frame_period = 1.0/60; render_ema = 0.005; t_shown = None
+    last_vals = None; last_source_t = None
     running=True
-    while running:
-        for e in pygame.event.get():
-            if e.type==pygame.QUIT: running=False
-            if e.type==pygame.KEYDOWN and e.key in (pygame.K_q, pygame.K_ESCAPE): running=False
+    try:
+        while running:
+            t_ev = time.perf_counter()
+            for e in (pygame.event.get() if pygame.display.get_init() else ()):
+                if e.type==pygame.QUIT: running=False
+                if e.type==pygame.KEYDOWN and e.key in (pygame.K_q, pygame.K_ESCAPE): running=False
+            if stats_srv is not None:
+                stats_srv.poll()
+            d_ev = time.perf_counter() - t_ev
 
-        # lees laatste pakket
-        try:
-            while True:
-                data, _ = sock.recvfrom(64)
-                n = len(data)
-                if n >= 10:
-                    Lx,Ly,Lb,Lp,Rx,Ry,Rb,Rp,Li,Ri = struct.unpack("10B", data[:10])
-                    if args.eye == "left":
-                        eye.set_targets_from_bytes(Lx,Ly,Lb,Lp, biris=Li)
-                    else:
-                        eye.set_targets_from_bytes(Rx,Ry,Rb,Rp, biris=Ri)
-                elif n >= 8:
-                    Lx,Ly,Lb,Lp,Rx,Ry,Rb,Rp = struct.unpack("8B", data[:8])
-                    if args.eye == "left":
-                        eye.set_targets_from_bytes(Lx,Ly,Lb,Lp)
-                    else:
-                        eye.set_targets_from_bytes(Rx,Ry,Rb,Rp)
-                else:
-                    break
-        except BlockingIOError:
-            pass
+            # Late-latch: na de vorige flip pas beginnen vlak voor de volgende, zodat
+            # het pakket dat we dan lezen zo vers mogelijk is
+            if args.late_latch and t_shown is not None and not idle:
+                slack = t_shown + frame_period - render_ema - CFG["LATCH_MARGIN"] - time.perf_counter()
+                if slack > 0: time.sleep(slack)
 
-        now=time.perf_counter(); dt=max(0.0005, min(0.05, now-prev)); prev=now
-        eye.update(dt)
-        eye.draw()
-        pygame.display.flip()
-        if args.novsync: clock.tick(60)
+            # nieuwste pakket uit de mailbox, of geïnterpoleerd uit de jitterbuffer
+            t_udp = time.perf_counter()
+            pkt = rx.take()
+            if jitter is not None:
+                while rx.queue:
+                    qp = rx.queue.popleft()
+                    record_packet(qp)
+                    jitter.push(qp)
+                vals = jitter.sample(time.perf_counter())
+                if vals is not None and vals != last_vals:
+                    last_vals = vals
+                    apply_vals(vals)
+                # leeftijd meten zodra een nieuw pakket in de sample meetelt
+                if jitter.source_t is not None and jitter.source_t != last_source_t:
+                    last_source_t = jitter.source_t
+                    for eye in eyes:
+                        eye.packet_t = last_source_t
+            elif pkt is not None:
+                apply_packet(pkt)
+
+            now=time.perf_counter(); dt=now-prev; prev=now
+            d_udp = now - t_udp
+            take_rebuild_time()
+            if life is not None:
+                life.update(now, eyes)
+            update_eyes(eyes, dt)
+
+            # Stil: niet renderen maar blokkeren op de socket (wakker bij nieuw pakket).
+            # Eerst nog één frame met de waarden exact op het doel, dan slapen.
+            settled = (not args.no_idle and all([eye.settled() for eye in eyes])
+                       and (jitter is None or not jitter.pending(now)))
+            if settled and idle:
+                rx.wait(CFG["IDLE_POLL"])
+                prev = time.perf_counter()
+                t_idle += prev - now
+            else:
+                t_upd = time.perf_counter() - now
+                d_rb = take_rebuild_time()
+                presenter.present(eyes)
+                t_prev_shown, t_shown = t_shown, time.perf_counter()
+                t_render += t_shown - now
+                d_rb += take_rebuild_time()
+                for ph, d in (("events", d_ev), ("udp", d_udp), ("update", t_upd), ("rebuild", d_rb),
+                              ("draw", presenter.draw_s), ("flip", presenter.flip_s),
+                              ("frame", d_ev + d_udp + t_upd + presenter.draw_s + presenter.flip_s)):
+                    phases.add(ph, d)
+                if governor is not None:
+                    governor.add(d_ev + d_udp + t_upd + presenter.draw_s, t_shown)
+                if eyes[0].packet_t is not None:
+                    ages.add(t_shown - eyes[0].packet_t)
+                    for eye in eyes:
+                        eye.packet_t = None
+                render_ema += 0.1 * (t_upd + presenter.draw_s - render_ema)
+                if not args.novsync and t_prev_shown is not None and not idle:
+                    frame_period += 0.05 * (clamp(t_shown - t_prev_shown, 0.004, 0.05) - frame_period)
+                if args.novsync and not args.late_latch: clock.tick(60)
+            idle = settled
+
+            if args.report_every > 0 and now - last_report >= args.report_every:
+                last_report = now
+                busy = 100.0 * t_render / max(1e-9, t_render + t_idle)
+                print(f"[{args.eye}] render {t_render:.1f} s / idle {t_idle:.1f} s ({busy:.0f}% actief); "
+                      f"{presenter.stats(args.width*args.height)}; {rx.stats()}; {ages.stats()}"
+                      + (f"; {jitter.stats()}" if jitter else "") + (f"; {life.stats()}" if life else ""))
+                print(f"[{args.eye}] {phases.line()}")
+            phases.roll(now)
+            if first_frame:
+                first_frame = False
+                hm = f", cache {cache.hits} hit / {cache.misses} miss" if cache else ""
+                print(f"[{args.eye}] eerste frame na {(time.perf_counter()-t_start)*1000:.0f} ms{hm}")
+    except KeyboardInterrupt:
+        pass
 
+    rx.stop()
+    if stats_srv is not None:
+        stats_srv.close()
+    if record is not None:
+        record.close()
+    print(f"[{args.eye}] {pupils.stats()}")
+    print(f"[{args.eye}] {presenter.stats(args.width*args.height)}; {rx.stats()}; {ages.stats()}"
+          + (f"; {jitter.stats()}" if jitter else "") + (f"; {life.stats()}" if life else ""))
+    print(f"[{args.eye}] {phases.line()}")
+    if args.backend == "fb":
+        for fb in outs: fb.close()
     pygame.quit()
 
 if __name__=="__main__":
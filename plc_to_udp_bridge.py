@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import socket
+import struct
 import time
 import snap7
 from snap7.util import get_real, get_byte
@@ -17,6 +18,11 @@ PERIOD   = 0.02             # 20 ms ≈ 50 Hz zendfrequentie
 # UDP doel (oog-daemon draait lokaal; 127.0.0.1 is prima)
 EYES_HOST, EYES_PORT = "127.0.0.1", 5005
 
+# Volgnummer + zendtijd vóór elk oogpakket (b"KOSQ", u16 seq, u32 ms) zodat de
+# jitterbuffer van het oog (--jitter-ms) kan ordenen en interpoleren.
+# Alleen aanzetten als alle ontvangers de header kennen (oog met --seq-header).
+SEQ_HEADER = False
+
 # Offsets in DB1 (non-optimized!). REAL of BYTE zijn toegestaan.
 # Laat Liris/Riris op None als je die (nog) niet gebruikt.
 OFF = {
@@ -24,6 +30,14 @@ OFF = {
     "Rx": 100,   "Ry": 104,   "Rpupil": 108,   "Rlid": 112,     # rechteroog
     "Liris": None,            # bv 20  (REAL 0..1 of BYTE 0..255)
     "Riris": None,            # bv 120 (REAL 0..1 of BYTE 0..255)
+    "Lrot": None,             # pupilkanteling, bv 24  (REAL -1..1 of BYTE 0..255, 128 = recht)
+    "Rrot": None,             # bv 124
+    "Lblink": None,           # knipperteller (BYTE, +1 per knipper), bv 28; het oog knippert lokaal
+    "Rblink": None,           # bv 128
+    "Lexpr": None,            # expressie-preset (BYTE, 0 = geen), bv 29
+    "Rexpr": None,            # bv 129
+    "Lblend": None,           # overvloeitijd naar de preset (BYTE, x 20 ms), bv 30
+    "Rblend": None,           # bv 130
     # Kaak is voortaan via snap7 direct geregeld → geen UDP meer
 }
 
@@ -69,7 +83,7 @@ def two_axis(buf, nx, ny):
     return bx, by
 
 def build_eye_packet(buf):
-    """Maak 8- of 10-byte oogpakket op basis van DB-buffer."""
+    """Maak 8-, 10-, 12-, 14- of 18-byte oogpakket op basis van DB-buffer."""
     Lx, Ly = two_axis(buf, "Lx", "Ly")
     Rx, Ry = two_axis(buf, "Rx", "Ry")
 
@@ -92,9 +106,40 @@ def build_eye_packet(buf):
     if isinstance(Li, float): Li = scale_to_byte_real(Li, 0.0, 1.0)
     if isinstance(Ri, float): Ri = scale_to_byte_real(Ri, 0.0, 1.0)
 
-    if Li is not None and Ri is not None:
-        return pkt8 + bytes([int(Li), int(Ri)])
-    return pkt8
+    # optionele pupilkanteling (vereist de irisbytes; zonder iris neutraal 128)
+    Lr = read_val(buf, OFF["Lrot"], "real") if OFF.get("Lrot") is not None else None
+    Rr = read_val(buf, OFF["Rrot"], "real") if OFF.get("Rrot") is not None else None
+    if isinstance(Lr, float): Lr = scale_to_byte_real(Lr, -1.0, 1.0)
+    if isinstance(Rr, float): Rr = scale_to_byte_real(Rr, -1.0, 1.0)
+
+    # optionele knipperteller (alleen de laagste 8 bits; het oog kijkt naar verandering)
+    Le = read_val(buf, OFF["Lblink"], "byte") if OFF.get("Lblink") is not None else None
+    Re = read_val(buf, OFF["Rblink"], "byte") if OFF.get("Rblink") is not None else None
+
+    # optionele expressie-preset + overvloeitijd
+    Lex, Rex, Lbl, Rbl = (read_val(buf, OFF[k], "byte") if OFF.get(k) is not None else None
+                          for k in ("Lexpr", "Rexpr", "Lblend", "Rblend"))
+
+    # alle extra velden op volgorde; het pakket stopt na de laatste groep die de PLC levert
+    tail = [128 if Li is None else Li, 128 if Ri is None else Ri,
+            128 if Lr is None else Lr, 128 if Rr is None else Rr,
+            Le or 0, Re or 0, Lex or 0, Rex or 0, Lbl or 0, Rbl or 0]
+    if Lex is not None or Rex is not None:
+        n = 10                       # 18 bytes
+    elif Le is not None or Re is not None:
+        n = 6                        # 14 bytes
+    elif Lr is not None or Rr is not None:
+        n = 4                        # 12 bytes
+    elif Li is not None and Ri is not None:
+        n = 2                        # 10 bytes
+    else:
+        n = 0
+    return pkt8 + bytes(int(v) & 0xFF for v in tail[:n])
+
+def seq_header(seq):
+    """Header voor de jitterbuffer: magic, volgnummer (u16), zendtijd in ms (u32)."""
+    t_ms = int(time.monotonic() * 1000) & 0xFFFFFFFF
+    return struct.pack("<4sHI", b"KOSQ", seq & 0xFFFF, t_ms)
 
 # ----------------------------
 # ROBUUSTE MAIN MET RECONNECT
@@ -108,7 +153,8 @@ def main():
     read_size  = (max(used_offsets) + 16) if used_offsets else 64
 
     print(f"[bridge] start: PLC={PLC_IP} rack/slot={RACK}/{SLOT} DB={DB} read_size={read_size} period={PERIOD}s")
-    print(f"[bridge] eyes -> {EYES_HOST}:{EYES_PORT}")
+    print(f"[bridge] eyes -> {EYES_HOST}:{EYES_PORT}" + (" (met seq-header)" if SEQ_HEADER else ""))
+    seq = 0
 
     while True:
         # Blijf verbinden tot het lukt
@@ -134,6 +180,9 @@ def main():
 
                 # Ogen
                 pkt = build_eye_packet(buf)
+                if SEQ_HEADER:
+                    pkt = seq_header(seq) + pkt
+                    seq += 1
                 sock_eye.sendto(pkt, (EYES_HOST, EYES_PORT))
 
                 # Ritme aanhouden